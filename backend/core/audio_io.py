@@ -0,0 +1,377 @@
+"""
+Audio I/O - Microphone and playback helpers shared by the voice loop and voice tests
+Shares one PortAudio session, opens callback-driven input streams, measures
+chunk energy, picks the smallest input buffer the device can sustain and
+plays audio files in-process.
+"""
+
+import os
+import atexit
+import json
+import queue
+import threading
+import logging
+from array import array
+
+logger = logging.getLogger(__name__)
+
+# Try importing PyAudio (microphone access)
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+    logger.warning("PyAudio not installed. Install with: pip install pyaudio")
+
+try:
+    import winsound
+except ImportError:
+    winsound = None  # Windows only; play_file needs it for WAV
+
+try:
+    import pygame
+except ImportError:
+    pygame = None  # play_file needs it for MP3 and other non-WAV formats
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # rms_energy falls back to array + a Python loop
+
+try:
+    import numpy_rms
+except ImportError:
+    numpy_rms = None  # Optional SIMD RMS kernel; rms_energy uses np.dot without it
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # vad_step runs its decision in Python on the vectorized RMS
+
+# Candidate frames_per_buffer values, lowest latency first
+BUFFER_SIZES = (256, 512, 1024, 2048)
+PROBE_SECONDS = 1.0
+
+# Probed buffer size per input device, kept across runs
+AUDIO_CONFIG_PATH = os.path.join(os.path.expanduser("~"), ".jarvis", "audio_cfg.json")
+
+# Shared PyAudio instance (lazy loaded)
+_pyaudio = None
+
+
+def get_pyaudio():
+    """
+    Get the shared PyAudio instance.
+    
+    PortAudio is initialized on first use and terminated at interpreter
+    exit, so repeated runs in one process don't re-enumerate host APIs.
+    """
+    global _pyaudio
+    
+    if _pyaudio is None:
+        if pyaudio is None:
+            raise ImportError("PyAudio not available")
+        _pyaudio = pyaudio.PyAudio()
+        atexit.register(_pyaudio.terminate)
+    
+    return _pyaudio
+
+
+def open_mic_stream(audio=None, rate: int = 16000, channels: int = 1,
+                    frames_per_buffer: int = 1024, start: bool = True):
+    """
+    Open a paInt16 input stream that captures on PortAudio's callback thread.
+    
+    Every buffer is queued as raw bytes, so console output or a GC pause on
+    the reading thread can't make the device drop input.
+    
+    Args:
+        audio: pyaudio.PyAudio instance (default: the shared one)
+        rate: Sample rate
+        channels: Channel count
+        frames_per_buffer: Frames per queued chunk
+        start: Start capturing immediately (False: call stream.start_stream())
+    
+    Returns:
+        (stream, chunks): The PyAudio stream and the queue.Queue it fills
+    """
+    chunks = queue.Queue()
+    
+    def on_audio(in_data, frame_count, time_info, status):
+        chunks.put_nowait(in_data)
+        return (None, pyaudio.paContinue)
+    
+    stream = (audio or get_pyaudio()).open(
+        format=pyaudio.paInt16,
+        channels=channels,
+        rate=rate,
+        input=True,
+        frames_per_buffer=frames_per_buffer,
+        stream_callback=on_audio,
+        start=start
+    )
+    
+    return stream, chunks
+
+
+def capture(stream, chunks: queue.Queue, stop: threading.Event, chunk: int):
+    """Audio I/O thread for blocking streams: push raw chunks until stopped, then None"""
+    try:
+        while not stop.is_set():
+            chunks.put(stream.read(chunk, exception_on_overflow=False))
+    finally:
+        chunks.put(None)  # Also on a read error, so the consumer never blocks forever
+
+
+def record_utterance(stream, rate: int = 16000, chunk: int = 320, max_seconds: int = 5,
+                     vad=None, end_silence_chunks: int = 15) -> memoryview:
+    """
+    Record until the speaker pauses (or max_seconds is reached).
+    
+    Capture runs on its own thread and hands chunks over a queue; this thread
+    runs the VAD on each chunk and copies it into one preallocated buffer.
+    
+    Args:
+        stream: Open blocking paInt16 mono input stream
+        rate: Sample rate of the stream
+        chunk: Frames per read (webrtcvad needs 10/20/30 ms)
+        max_seconds: Recording length limit
+        vad: webrtcvad.Vad instance, or None to record the full max_seconds
+        end_silence_chunks: Non-speech chunks after speech that end the utterance
+    
+    Returns:
+        memoryview: The recorded 16-bit PCM (a view, no copy)
+    
+    Raises:
+        OSError: If the stream fails mid-recording (e.g. the device was unplugged)
+    """
+    buf = bytearray(rate * max_seconds * 2)
+    view = memoryview(buf)
+    pos = 0
+    heard_speech = False
+    silent_chunks = 0
+    
+    chunks = queue.Queue()
+    stop = threading.Event()
+    errors = []
+    
+    def read_chunks():
+        try:
+            capture(stream, chunks, stop, chunk)
+        except Exception as e:
+            errors.append(e)
+    
+    reader = threading.Thread(target=read_chunks, daemon=True)
+    reader.start()
+    
+    while (data := chunks.get()) is not None:
+        n = min(len(data), len(buf) - pos)
+        view[pos:pos + n] = data[:n]
+        pos += n
+        
+        if vad is not None:
+            if vad.is_speech(data, rate):
+                heard_speech = True
+                silent_chunks = 0
+            elif heard_speech:
+                silent_chunks += 1
+        
+        if pos % (chunk * 2 * 25) == 0:  # every 25 chunks (0.5 s at 20 ms)
+            percent = pos * 100 // len(buf)
+            bars = "█" * (percent // 5)
+            print(f"   [{bars:<20}] {percent}%", end='\r')
+        
+        if pos >= len(buf) or silent_chunks >= end_silence_chunks:
+            break
+    
+    stop.set()
+    reader.join()
+    if errors:
+        raise errors[0]
+    return view[:pos]
+
+
+def play_file(audio_path: str, wait: bool = False):
+    """
+    Play an audio file without spawning a shell.
+    
+    WAV goes through winsound; other formats (Edge TTS MP3) through the
+    pygame mixer, which is only opened on first use.
+    
+    Args:
+        audio_path: Path to the audio file
+        wait: Block until playback finishes
+    """
+    if audio_path.lower().endswith('.wav'):
+        if winsound is None:
+            logger.warning("winsound not available - cannot play WAV")
+            return
+        flags = winsound.SND_FILENAME if wait else winsound.SND_FILENAME | winsound.SND_ASYNC
+        winsound.PlaySound(audio_path, flags)
+        return
+    
+    if pygame is None:
+        logger.warning("pygame not available - cannot play audio")
+        return
+    
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+    pygame.mixer.music.load(audio_path)
+    pygame.mixer.music.play()
+    
+    if wait:
+        while pygame.mixer.music.get_busy():
+            pygame.time.Clock().tick(10)
+
+
+def drain(chunks: queue.Queue):
+    """Discard chunks that were queued before the caller was ready for them"""
+    while True:
+        try:
+            chunks.get_nowait()
+        except queue.Empty:
+            return
+
+
+def rms_energy(data: bytes) -> int:
+    """RMS energy of one raw int16 chunk (numpy-rms SIMD kernel > numpy > array fallback)"""
+    if np is None:
+        samples = array('h')
+        samples.frombytes(data)
+        return int((sum(s * s for s in samples) / len(samples)) ** 0.5)
+    
+    if numpy_rms is not None:
+        # numpy_rms works on float32 windows; one window spanning the chunk gives its RMS
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+        return int(numpy_rms.rms(samples, window_size=len(samples))[0])
+    
+    # int16 dot products overflow, so widen before the fused multiply-add
+    samples = np.frombuffer(data, dtype=np.int16).astype(np.int64)
+    return int(np.sqrt(np.dot(samples, samples) / samples.size))
+
+
+def _vad_decide(energy, started, silence_chunks, silence_threshold, speech_threshold, max_silence):
+    """
+    Energy VAD start/stop decision for one chunk.
+    Returns (energy, started, silence_chunks, done).
+    """
+    # Start on speech
+    if not started:
+        if energy > speech_threshold:
+            return energy, True, 0, False
+        return energy, False, silence_chunks, False
+    
+    # Count consecutive silent chunks while recording
+    if energy < silence_threshold:
+        silence_chunks += 1
+    else:
+        silence_chunks = 0
+    return energy, True, silence_chunks, silence_chunks >= max_silence
+
+
+if njit is not None:
+    _decide = njit(cache=True)(_vad_decide)
+    
+    @njit(cache=True)
+    def vad_step(samples, started, silence_chunks, silence_threshold, speech_threshold, max_silence):
+        """
+        Energy VAD for one int16 chunk (compiled; the loop is cheap under numba).
+        Returns (energy, started, silence_chunks, done).
+        """
+        total = 0.0
+        for s in samples:
+            total += float(s) * float(s)
+        energy = int(np.sqrt(total / samples.size))
+        return _decide(energy, started, silence_chunks, silence_threshold, speech_threshold, max_silence)
+else:
+    def vad_step(samples, started, silence_chunks, silence_threshold, speech_threshold, max_silence):
+        """
+        Energy VAD for one int16 chunk (vectorized RMS, scalar decision in Python).
+        Returns (energy, started, silence_chunks, done).
+        """
+        return _vad_decide(rms_energy(samples), started, silence_chunks,
+                           silence_threshold, speech_threshold, max_silence)
+
+
+def warm_up_vad_step(chunk: int):
+    """Compile vad_step for read-only int16 chunks now rather than on the first recording"""
+    if njit is not None:
+        vad_step(np.frombuffer(bytes(chunk * 2), dtype=np.int16), False, 0, 0, 0, 1)
+
+
+def _load_config() -> dict:
+    """Read the cached per-device settings (empty if missing or unreadable)"""
+    try:
+        with open(AUDIO_CONFIG_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_config(config: dict):
+    """Write the per-device settings cache"""
+    try:
+        os.makedirs(os.path.dirname(AUDIO_CONFIG_PATH), exist_ok=True)
+        with open(AUDIO_CONFIG_PATH, "w", encoding="utf-8") as f:
+            json.dump(config, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not save audio config: {e}")
+
+
+def _survives(audio, frames_per_buffer: int, rate: int, channels: int) -> bool:
+    """Capture PROBE_SECONDS with the given buffer size; False on open error or input overflow"""
+    try:
+        stream = audio.open(
+            format=pyaudio.paInt16,
+            channels=channels,
+            rate=rate,
+            input=True,
+            frames_per_buffer=frames_per_buffer
+        )
+    except OSError:
+        return False
+    
+    try:
+        for _ in range(max(1, int(rate * PROBE_SECONDS / frames_per_buffer))):
+            stream.read(frames_per_buffer, exception_on_overflow=True)
+        return True
+    except OSError:
+        return False
+    finally:
+        stream.stop_stream()
+        stream.close()
+
+
+def preferred_buffer_size(audio, rate: int = 16000, channels: int = 1) -> int:
+    """
+    Smallest frames_per_buffer the default input device captures without overflow.
+    
+    The first call for a device probes each of BUFFER_SIZES for about a
+    second; the result is cached in AUDIO_CONFIG_PATH, so later runs only
+    read the file.
+    
+    Args:
+        audio: pyaudio.PyAudio instance
+        rate: Sample rate the stream will use
+        channels: Channel count the stream will use
+    
+    Returns:
+        int: Buffer size in frames (largest candidate if none survived)
+    """
+    device = audio.get_default_input_device_info()
+    key = f"{device['name']}@{rate}"
+    
+    config = _load_config()
+    if key in config:
+        return config[key]
+    
+    logger.info(f"Probing input buffer sizes for '{device['name']}'...")
+    size = next(
+        (size for size in BUFFER_SIZES if _survives(audio, size, rate, channels)),
+        BUFFER_SIZES[-1]
+    )
+    logger.info(f"✓ Using {size}-frame input buffer for '{device['name']}'")
+    
+    config[key] = size
+    _save_config(config)
+    
+    return size
@@ -6,7 +6,7 @@ The "brain" of Jarvis that processes user commands and routes to appropriate ski
 import logging
 import re
 import time
-from typing import Dict, Callable, Any, Optional
+from typing import Dict, Callable, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -328,11 +328,140 @@ SKILLS: Dict[str, Callable] = {
 }
 
 
+# ============================================================================
+# MUSIC COMMAND EXTRACTION
+# ============================================================================
+
+MUSIC_KEYWORDS = ["play", "youtube", "spotify", "song"]
+
+# "<n>. SONG: <name> | PLATFORM: <platform>" lines of a batch extraction reply
+_BATCH_MUSIC_LINE = re.compile(r"^\s*(\d+)\.\s*SONG:\s*(.+?)\s*\|\s*PLATFORM:\s*(\w+)", re.MULTILINE)
+
+
+def _ai_extract_music(original_text: str) -> Tuple[str, Optional[str]]:
+    """
+    Extract (song, platform) from one music command with Qwen.
+    Raises ValueError if the model's reply can't be used.
+    """
+    from backend.core.qwen_api import chat_completion
+    
+    query = None
+    platform = None
+    
+    extraction_prompt = f"""Analyze this music command and extract the song name and platform.
+
+Command: "{original_text}"
+
+Return in this exact format:
+SONG: [song name here]
+PLATFORM: [spotify/youtube/default]
+
+Rules:
+- Extract the actual song/artist name (remove: "play", "on", "song", "the")
+- Detect platform: If command mentions "spotify", return "spotify". If mentions "youtube", return "youtube". Otherwise return "default"
+- Be smart about extraction
+
+Examples:
+"play tears on spotify" → 
+SONG: tears
+PLATFORM: spotify
+
+"song tears on youtube" →
+SONG: tears
+PLATFORM: youtube
+
+"the song tears" →
+SONG: tears
+PLATFORM: default
+
+"play shape of you" →
+SONG: shape of you
+PLATFORM: default
+
+Now analyze:"""
+
+    messages = [
+        {"role": "system", "content": "You are a music command analyzer. Extract song name and platform. Return in the exact format requested."},
+        {"role": "user", "content": extraction_prompt}
+    ]
+    
+    ai_response = chat_completion(messages, temperature=0.1, max_tokens=100, use_personality=False)
+    
+    # Parse AI response
+    if ai_response and not ai_response.startswith("Error"):
+        lines = ai_response.strip().split('\n')
+        for line in lines:
+            if line.startswith("SONG:"):
+                query = line.replace("SONG:", "").strip().strip('"').strip("'")
+            elif line.startswith("PLATFORM:"):
+                platform = line.replace("PLATFORM:", "").strip().lower()
+        
+        if query:
+            logger.info(f"AI extracted - Song: '{query}', Platform: '{platform}' from '{original_text}'")
+            return query, platform
+        raise ValueError("AI failed to extract song name")
+    raise ValueError("AI returned error or invalid response")
+
+
+
+def _ai_extract_music_batch(commands: List[str]) -> List[Optional[Tuple[str, str]]]:
+    """
+    Extract (song, platform) for several music commands with one Qwen call.
+    
+    Returns:
+        List aligned with commands; None where the reply had no usable line
+    """
+    from backend.core.qwen_api import chat_completion
+    
+    numbered = "\n".join(f"{i}. {command}" for i, command in enumerate(commands, 1))
+    extraction_prompt = f"""Analyze each music command below and extract the song name and platform.
+
+Commands:
+{numbered}
+
+Return one line per command, numbered the same way, in this exact format:
+<number>. SONG: [song name here] | PLATFORM: [spotify/youtube/default]
+
+Rules:
+- Extract the actual song/artist name (remove: "play", "on", "song", "the")
+- Detect platform: If command mentions "spotify", return "spotify". If mentions "youtube", return "youtube". Otherwise return "default"
+- Be smart about extraction
+
+Examples:
+1. play tears on spotify
+2. the song tears
+→
+1. SONG: tears | PLATFORM: spotify
+2. SONG: tears | PLATFORM: default
+
+Now analyze:"""
+
+    messages = [
+        {"role": "system", "content": "You are a music command analyzer. Extract song name and platform. Return in the exact format requested."},
+        {"role": "user", "content": extraction_prompt}
+    ]
+    
+    ai_response = chat_completion(messages, temperature=0.1, max_tokens=40 * len(commands), use_personality=False)
+    
+    results = [None] * len(commands)
+    if not ai_response or ai_response.startswith("Error"):
+        return results
+    
+    for match in _BATCH_MUSIC_LINE.finditer(ai_response):
+        index = int(match.group(1)) - 1
+        song = match.group(2).strip().strip('"').strip("'")
+        if 0 <= index < len(commands) and song:
+            results[index] = (song, match.group(3).lower())
+    
+    return results
+
+
 # ============================================================================
 # COMMAND PROCESSING
 # ============================================================================
 
-def process_command(text: str, user_id: str = "default_user", user_language: str = "en") -> Dict[str, Any]:
+def process_command(text: str, user_id: str = "default_user", user_language: str = "en", stream: bool = False,
+                    _music: Optional[Tuple[str, str]] = None) -> Dict[str, Any]:
     """
     Process user command and route to appropriate skill.
     
@@ -349,6 +478,11 @@ def process_command(text: str, user_id: str = "default_user", user_language: str
         text: User's spoken/typed command
         user_id: Unique identifier for user (for conversation context)
         user_language: Language user spoke in ('en', 'hi', 'unknown'/'mixed')
+        stream: If the command goes to the LLM, return a "response_stream"
+                iterator of text chunks instead of a finished "response"
+                (see stream_command)
+        _music: (song, platform) already extracted by process_commands;
+                internal, skips the per-command Qwen extraction
     
     Returns:
         Dict with response, intent, and any additional data
@@ -514,69 +648,19 @@ def process_command(text: str, user_id: str = "default_user", user_language: str
             }
     
     # YouTube playback and Music (Spotify/YouTube)
-    if any(keyword in text_lower for keyword in ["play", "youtube", "spotify", "song"]):
+    if any(keyword in text_lower for keyword in MUSIC_KEYWORDS):
         try:
             # Use AI to extract both song name AND platform intelligently
             query = None
             platform = None
             
             try:
-                from backend.core.qwen_api import chat_completion
-                
-                extraction_prompt = f"""Analyze this music command and extract the song name and platform.
-
-Command: "{original_text}"
-
-Return in this exact format:
-SONG: [song name here]
-PLATFORM: [spotify/youtube/default]
-
-Rules:
-- Extract the actual song/artist name (remove: "play", "on", "song", "the")
-- Detect platform: If command mentions "spotify", return "spotify". If mentions "youtube", return "youtube". Otherwise return "default"
-- Be smart about extraction
-
-Examples:
-"play tears on spotify" → 
-SONG: tears
-PLATFORM: spotify
-
-"song tears on youtube" →
-SONG: tears
-PLATFORM: youtube
-
-"the song tears" →
-SONG: tears
-PLATFORM: default
-
-"play shape of you" →
-SONG: shape of you
-PLATFORM: default
-
-Now analyze:"""
-
-                messages = [
-                    {"role": "system", "content": "You are a music command analyzer. Extract song name and platform. Return in the exact format requested."},
-                    {"role": "user", "content": extraction_prompt}
-                ]
-                
-                ai_response = chat_completion(messages, temperature=0.1, max_tokens=100, use_personality=False)
-                
-                # Parse AI response
-                if ai_response and not ai_response.startswith("Error"):
-                    lines = ai_response.strip().split('\n')
-                    for line in lines:
-                        if line.startswith("SONG:"):
-                            query = line.replace("SONG:", "").strip().strip('"').strip("'")
-                        elif line.startswith("PLATFORM:"):
-                            platform = line.replace("PLATFORM:", "").strip().lower()
-                    
-                    if query:
-                        logger.info(f"AI extracted - Song: '{query}', Platform: '{platform}' from '{original_text}'")
-                    else:
-                        raise ValueError("AI failed to extract song name")
+                if _music is not None:
+                    # Already extracted by process_commands' batch call
+                    query, platform = _music
+                    logger.info(f"Batch extracted - Song: '{query}', Platform: '{platform}' from '{original_text}'")
                 else:
-                    raise ValueError("AI returned error or invalid response")
+                    query, platform = _ai_extract_music(original_text)
                 
             except Exception as e:
                 logger.warning(f"AI extraction failed, using regex fallback: {e}")
@@ -886,6 +970,15 @@ Now analyze:"""
         user_message = original_text + language_instruction
         messages.append({"role": "user", "content": user_message})
         
+        if stream:
+            return {
+                "response_stream": _stream_chat(messages, max_tokens, user_id, original_text),
+                "intent": "chat",
+                "success": True,
+                "method": "llm_stream",
+                "language": language
+            }
+        
         # Call Qwen with personality (personality injected automatically in qwen_api.py)
         chat_response = qwen_api.chat_completion(
             messages,
@@ -928,6 +1021,72 @@ Now analyze:"""
         }
 
 
+def _stream_chat(messages: list, max_tokens: int, user_id: str, user_input: str) -> Iterator[str]:
+    """Yield the Qwen reply as it streams in; save the full reply once it ends"""
+    parts = []
+    for chunk in qwen_api.chat_completion_stream(
+        messages,
+        temperature=TEMPERATURE_SETTINGS['conversational'],
+        max_tokens=max_tokens
+    ):
+        parts.append(chunk)
+        yield chunk
+    
+    try:
+        save_conversation(user_id, user_input, "".join(parts).strip())
+    except Exception as e:
+        logger.warning(f"Failed to save conversation: {e}")
+
+
+def stream_command(text: str, user_id: str = "default_user", user_language: str = "en") -> Iterator[str]:
+    """
+    Streaming variant of process_command for lower time-to-first-audio.
+    
+    LLM replies are yielded chunk by chunk as Qwen generates them, so a
+    caller can hand each finished sentence to TTS right away. Commands
+    answered without the LLM (skills, quick replies) yield their full
+    response once. Follow-up detection is not run for streamed replies.
+    
+    Example:
+        for chunk in stream_command("Tell me about black holes"):
+            print(chunk, end="", flush=True)
+    """
+    result = process_command(text, user_id, user_language, stream=True)
+    
+    if "response_stream" in result:
+        yield from result["response_stream"]
+    else:
+        yield result.get("response", "")
+
+
+def process_commands(texts: List[str], user_id: str = "default_user", user_language: str = "en") -> List[Dict[str, Any]]:
+    """
+    Process several commands in order (e.g. a batch of test phrases).
+    
+    Song/platform extraction for all music commands is done with a single
+    Qwen call up front instead of one call per command. Everything else
+    goes through process_command unchanged.
+    
+    Returns:
+        List of process_command results, aligned with texts
+    
+    Example:
+        for result in process_commands(["play tears on spotify", "play thunder on youtube"]):
+            print(result.get("query"))
+    """
+    music = [i for i, text in enumerate(texts) if any(keyword in text.lower() for keyword in MUSIC_KEYWORDS)]
+    extracted = [None] * len(texts)
+    
+    if len(music) > 1:
+        try:
+            for i, pair in zip(music, _ai_extract_music_batch([texts[i] for i in music])):
+                extracted[i] = pair
+        except Exception as e:
+            logger.warning(f"Batch music extraction failed, extracting per command: {e}")
+    
+    return [process_command(text, user_id, user_language, _music=pair) for text, pair in zip(texts, extracted)]
+
+
 # ============================================================================
 # UTILITIES
 # ============================================================================
@@ -4,7 +4,11 @@ Handles conversation history, PDF summaries, and alarms storage.
 """
 
 import os
+import time
+import queue
+import atexit
 import logging
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional
 from pymongo import MongoClient, DESCENDING
@@ -16,19 +20,34 @@ logger = logging.getLogger(__name__)
 _client: Optional[MongoClient] = None
 _db = None
 
+# Connection pool / wire settings for the single shared client.
+# Unavailable compressors (zstandard, python-snappy not installed) are
+# skipped by pymongo, zlib is always available as a fallback.
+POOL_OPTIONS = {
+    "maxPoolSize": 200,
+    "minPoolSize": 10,
+    "maxIdleTimeMS": 300_000,
+    "serverSelectionTimeoutMS": 5000,
+    "compressors": "zstd,snappy,zlib",
+}
+
 
 def initialize():
     """
     Initialize MongoDB connection.
     Reads MONGO_URI from environment and connects.
+    Reuses the existing client (and its connection pool) if already connected.
     """
     global _client, _db
     
+    if _client is not None:
+        return
+    
     mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017/jarvis_db")
     
     try:
         logger.info(f"Connecting to MongoDB: {mongo_uri}")
-        _client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
+        _client = MongoClient(mongo_uri, **POOL_OPTIONS)
         
         # Extract database name from URI or use default
         if "/" in mongo_uri:
@@ -57,10 +76,21 @@ def _create_indexes():
     if _db is None:
         return
     
+    # Parsed up front: a malformed value must not skip the indexes below
+    try:
+        ttl_days = int(os.getenv("CONVERSATION_TTL_DAYS", "0") or 0)
+    except ValueError:
+        logger.warning(f"Invalid CONVERSATION_TTL_DAYS={os.getenv('CONVERSATION_TTL_DAYS')!r}, TTL disabled")
+        ttl_days = 0
+    
     try:
         # Index on timestamp for conversations
         _db.conversations.create_index([("timestamp", DESCENDING)])
         
+        # Optionally turn it into a TTL index so history stays bounded
+        if ttl_days > 0:
+            _set_conversation_ttl(ttl_days * 86400)
+        
         # Index on intent for conversations
         _db.conversations.create_index("intent")
         
@@ -93,6 +123,21 @@ def _create_indexes():
         logger.warning(f"Index creation warning: {e}")
 
 
+def _set_conversation_ttl(seconds: int):
+    """
+    Expire conversations older than `seconds` via the timestamp index.
+    Uses collMod so the existing index is converted in place (MongoDB 5.1+).
+    """
+    try:
+        _db.command(
+            "collMod", "conversations",
+            index={"keyPattern": {"timestamp": -1}, "expireAfterSeconds": seconds}
+        )
+        logger.info(f"✓ Conversation TTL set to {seconds // 86400} days")
+    except Exception as e:
+        logger.warning(f"Could not set conversation TTL: {e}")
+
+
 def ping():
     """
     Ping database to check connection.
@@ -157,21 +202,7 @@ def save_conversation(conversation_data: Dict) -> str:
         return "no_db"
     
     try:
-        # Build document with required fields
-        document = {
-            "timestamp": datetime.utcnow(),
-            "user_query": conversation_data.get("user_query", ""),
-            "jarvis_response": conversation_data.get("jarvis_response", ""),
-            "intent": conversation_data.get("intent", "unknown"),
-            "language_detected": conversation_data.get("language_detected", "en"),
-            "expects_followup": conversation_data.get("expects_followup", False),
-            "performance": conversation_data.get("performance", {}),
-        }
-        
-        # Add optional unix timestamp if provided
-        if "timestamp" in conversation_data:
-            document["unix_timestamp"] = conversation_data["timestamp"]
-        
+        document = _conversation_document(conversation_data)
         result = _db.conversations.insert_one(document)
         logger.info(f"Saved conversation: {result.inserted_id}")
         
@@ -182,6 +213,92 @@ def save_conversation(conversation_data: Dict) -> str:
         return "error"
 
 
+def _conversation_document(conversation_data: Dict) -> Dict:
+    """Build the stored document for a conversation turn (see save_conversation)"""
+    # Build document with required fields
+    document = {
+        "timestamp": datetime.utcnow(),
+        "user_query": conversation_data.get("user_query", ""),
+        "jarvis_response": conversation_data.get("jarvis_response", ""),
+        "intent": conversation_data.get("intent", "unknown"),
+        "language_detected": conversation_data.get("language_detected", "en"),
+        "expects_followup": conversation_data.get("expects_followup", False),
+        "performance": conversation_data.get("performance", {}),
+    }
+    
+    # Add optional unix timestamp if provided
+    if "timestamp" in conversation_data:
+        document["unix_timestamp"] = conversation_data["timestamp"]
+    
+    return document
+
+
+# Background conversation log: turns queued by log_conversation() are
+# written with one insert_many per batch instead of one round-trip each
+LOG_BATCH_SIZE = 20
+LOG_FLUSH_SECONDS = 0.5
+
+_log_queue: "queue.Queue[Dict]" = queue.Queue()
+_log_thread: Optional[threading.Thread] = None
+_log_lock = threading.Lock()
+
+
+def log_conversation(conversation_data: Dict):
+    """
+    Queue a conversation turn for a batched background write.
+    
+    Non-blocking alternative to save_conversation() for the voice hot path:
+    the caller only pays a queue put. Pending turns are flushed at exit, or
+    explicitly with flush_conversations().
+    
+    Args:
+        conversation_data: Same keys as save_conversation()
+    """
+    global _log_thread
+    
+    with _log_lock:
+        if _log_thread is None:
+            _log_thread = threading.Thread(target=_drain_conversation_log, name="mongo-log", daemon=True)
+            _log_thread.start()
+            atexit.register(flush_conversations)
+    
+    _log_queue.put(_conversation_document(conversation_data))
+
+
+def flush_conversations():
+    """Block until every turn queued by log_conversation() has been written"""
+    if _log_thread is not None:
+        _log_queue.join()
+
+
+def _drain_conversation_log():
+    """Writer thread: collect up to LOG_BATCH_SIZE turns or LOG_FLUSH_SECONDS, then insert"""
+    while True:
+        batch = [_log_queue.get()]
+        deadline = time.monotonic() + LOG_FLUSH_SECONDS
+        
+        while len(batch) < LOG_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_log_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        try:
+            if _db is None:
+                logger.warning(f"MongoDB not available - {len(batch)} conversation(s) not saved")
+            else:
+                _db.conversations.insert_many(batch, ordered=False)
+                logger.info(f"Saved {len(batch)} conversation(s)")
+        except Exception as e:
+            logger.error(f"Failed to save conversations: {e}")
+        finally:
+            for _ in batch:
+                _log_queue.task_done()
+
+
 def get_recent_history(limit: int = 20) -> List[Dict]:
     """
     Get recent conversation history.
@@ -280,7 +397,7 @@ def get_conversation_count() -> int:
         return 0
     
     try:
-        count = _db.conversations.count_documents({})
+        count = _db.conversations.estimated_document_count()
         return count
     except Exception as e:
         logger.error(f"Failed to count conversations: {e}")
@@ -474,7 +591,7 @@ def get_command_stats() -> Dict:
     
     try:
         # Total commands
-        total = _db.command_analytics.count_documents({})
+        total = _db.command_analytics.estimated_document_count()
         
         # Success rate
         successful = _db.command_analytics.count_documents({"success": True})
@@ -3,6 +3,8 @@ Jarvis Personality - Core personality definitions and prompts
 This module defines how Jarvis thinks, speaks, and behaves.
 """
 
+import re
+
 # ============================================================================
 # JARVIS CORE PERSONALITY
 # ============================================================================
@@ -157,6 +159,10 @@ MAX_CONVERSATION_LENGTH = 20
 # LANGUAGE DETECTION HELPERS
 # ============================================================================
 
+# Devanagari Unicode block
+_DEVANAGARI = re.compile('[\u0900-\u097F]')
+
+
 def detect_language(text: str) -> str:
     """
     Detect if text is primarily English or Hindi.
@@ -167,9 +173,9 @@ def detect_language(text: str) -> str:
     Returns:
         'en', 'hi', or 'mixed'
     """
-    # Simple heuristic - check for Devanagari script
-    hindi_chars = sum(1 for c in text if '\u0900' <= c <= '\u097F')
-    total_chars = len(text.replace(' ', ''))
+    # Simple heuristic - check for Devanagari script (counted in one C-level pass)
+    hindi_chars = len(text) - len(_DEVANAGARI.sub('', text))
+    total_chars = len(text) - text.count(' ')
     
     if total_chars == 0:
         return 'en'
@@ -184,6 +190,10 @@ def detect_language(text: str) -> str:
         return 'en'
 
 
+# Sentence punctuation that STT engines append to short utterances
+_STRIP_PUNCTUATION = str.maketrans("", "", ".,!?।")
+
+
 def is_quick_reply(text: str) -> tuple[bool, str]:
     """
     Check if user message is a quick reply that doesn't need LLM.
@@ -194,10 +204,12 @@ def is_quick_reply(text: str) -> tuple[bool, str]:
     Returns:
         (is_quick_reply, response_text)
     """
-    text_lower = text.lower().strip()
+    # Exact-phrase hash lookup; STT punctuation ("Thank you.") is dropped
+    # first so spoken replies hit the table instead of going to the LLM
+    reply = QUICK_REPLIES.get(text.lower().translate(_STRIP_PUNCTUATION).strip())
     
-    if text_lower in QUICK_REPLIES:
-        return True, QUICK_REPLIES[text_lower]
+    if reply is not None:
+        return True, reply
     
     return False, ""
 
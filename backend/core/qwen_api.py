@@ -6,8 +6,10 @@ Wrapper for calling Qwen LLM via OpenRouter for reasoning, summarization, and ch
 import os
 import logging
 import json
-from typing import List, Dict, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, List, Dict, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
 from .personality import JARVIS_PERSONALITY
 
 logger = logging.getLogger(__name__)
@@ -18,6 +20,26 @@ OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 # Default model (you can change this)
 DEFAULT_MODEL = "qwen/qwen-2.5-72b-instruct"  # or "qwen/qwen-2-7b-instruct" for faster responses
 
+# hedged_completion sends a backup request once the first one is slower than
+# roughly its p95 latency, routed to the fastest upstream for the same model
+HEDGE_DELAY_SECONDS = 2.0
+HEDGE_PROVIDER = {"sort": "latency"}  # OpenRouter provider routing preferences
+
+# Shared HTTP session so OpenRouter calls reuse keep-alive TLS connections
+# (pool sized for hedged/batched requests running in parallel)
+_session: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    """Get or create the shared HTTP session"""
+    global _session
+    
+    if _session is None:
+        _session = requests.Session()
+        _session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=8))
+    
+    return _session
+
 
 def _get_api_key() -> str:
     """
@@ -44,7 +66,8 @@ def chat_completion(
     model: Optional[str] = None,
     temperature: float = 0.7,
     max_tokens: int = 1000,
-    use_personality: bool = True
+    use_personality: bool = True,
+    provider: Optional[Dict] = None
 ) -> str:
     """
     Call OpenRouter chat completion API.
@@ -56,6 +79,7 @@ def chat_completion(
         temperature: Randomness (0.0 = deterministic, 1.0 = creative)
         max_tokens: Maximum response length
         use_personality: Whether to inject Jarvis personality (default: True)
+        provider: OpenRouter provider routing preferences (default: OpenRouter's choice)
     
     Returns:
         str: The assistant's response text
@@ -81,6 +105,159 @@ def chat_completion(
         logger.error(str(e))
         return f"Error: {e}"
     
+    headers, payload = _build_request(api_key, messages, model, temperature, max_tokens, use_personality)
+    model = payload["model"]
+    if provider:
+        payload["provider"] = provider
+    
+    try:
+        logger.info(f"Calling OpenRouter API with model: {model}")
+        
+        response = _get_session().post(
+            OPENROUTER_URL,
+            headers=headers,
+            json=payload,
+            timeout=30
+        )
+        
+        response.raise_for_status()  # Raise error for 4xx/5xx status codes
+        
+        data = response.json()
+        
+        # Extract assistant's message
+        assistant_message = data["choices"][0]["message"]["content"]
+        
+        logger.info(f"Received response ({len(assistant_message)} chars)")
+        
+        return assistant_message.strip()
+    
+    except requests.exceptions.RequestException as e:
+        logger.error(f"API request failed: {e}")
+        return f"Error calling LLM: {e}"
+    
+    except (KeyError, IndexError) as e:
+        logger.error(f"Unexpected API response format: {e}")
+        return "Error: Unexpected response from LLM"
+
+
+def chat_completion_stream(
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 1000,
+    use_personality: bool = True
+) -> Iterator[str]:
+    """
+    Streaming variant of chat_completion: yields the reply in text chunks
+    as OpenRouter sends them (server-sent events), so callers can start
+    speaking the first sentence before the whole reply is generated.
+    
+    Args:
+        Same as chat_completion
+    
+    Yields:
+        str: Consecutive pieces of the assistant's response text
+    
+    Example:
+        for chunk in chat_completion_stream([{"role": "user", "content": "Hi"}]):
+            print(chunk, end="", flush=True)
+    """
+    try:
+        api_key = _get_api_key()
+    except ValueError as e:
+        logger.error(str(e))
+        yield f"Error: {e}"
+        return
+    
+    headers, payload = _build_request(api_key, messages, model, temperature, max_tokens, use_personality)
+    payload["stream"] = True
+    
+    try:
+        logger.info(f"Streaming from OpenRouter API with model: {payload['model']}")
+        
+        with _get_session().post(OPENROUTER_URL, headers=headers, json=payload, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            response.encoding = "utf-8"  # text/event-stream has no charset; requests would assume latin-1
+            
+            for line in response.iter_lines(decode_unicode=True):
+                # SSE: "data: {...}" events, ": comment" keep-alives, "data: [DONE]" at the end
+                if not line or not line.startswith("data: "):
+                    continue
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    break
+                
+                content = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                if content:
+                    yield content
+    
+    except requests.exceptions.RequestException as e:
+        logger.error(f"API request failed: {e}")
+        yield f"Error calling LLM: {e}"
+    
+    except (KeyError, IndexError, ValueError) as e:
+        logger.error(f"Unexpected API stream format: {e}")
+        yield "Error: Unexpected response from LLM"
+
+
+def hedged_completion(
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    delay: float = HEDGE_DELAY_SECONDS,
+    **kwargs
+) -> str:
+    """
+    Hedged chat request: if the first request hasn't answered within
+    `delay` seconds (or fails), send the same request again routed to
+    OpenRouter's lowest-latency provider and return whichever reply
+    arrives first. Only slow requests cost a second call.
+    
+    Both requests use the same model, so the reply never comes from a
+    different (e.g. smaller) model; only the upstream provider serving
+    it can differ.
+    
+    Args:
+        messages: Same as chat_completion
+        model: Model to use (default: DEFAULT_MODEL)
+        delay: Seconds to wait before sending the backup request
+        **kwargs: Passed to chat_completion (temperature, max_tokens, ...)
+    
+    Returns:
+        str: The first non-error reply, or the last error if both failed
+    """
+    pool = ThreadPoolExecutor(2)
+    primary = pool.submit(chat_completion, messages, model, **kwargs)
+    
+    try:
+        done, _ = wait([primary], timeout=delay)
+        if done and not primary.result().startswith("Error"):
+            return primary.result()
+        
+        backup = pool.submit(chat_completion, messages, model, provider=HEDGE_PROVIDER, **kwargs)
+        pending = {backup} if done else {primary, backup}
+        reply = primary.result() if done else ""
+        
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                reply = future.result()
+                if not reply.startswith("Error"):
+                    return reply
+        return reply
+    finally:
+        # Requests in flight can't be interrupted; the slower one finishes in the background
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _build_request(
+    api_key: str,
+    messages: List[Dict[str, str]],
+    model: Optional[str],
+    temperature: float,
+    max_tokens: int,
+    use_personality: bool
+) -> Tuple[Dict[str, str], Dict]:
+    """Build OpenRouter headers and JSON payload (shared by chat_completion and its streaming variant)"""
     if model is None:
         model = DEFAULT_MODEL
     
@@ -111,34 +288,7 @@ def chat_completion(
         "max_tokens": max_tokens
     }
     
-    try:
-        logger.info(f"Calling OpenRouter API with model: {model}")
-        
-        response = requests.post(
-            OPENROUTER_URL,
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        
-        response.raise_for_status()  # Raise error for 4xx/5xx status codes
-        
-        data = response.json()
-        
-        # Extract assistant's message
-        assistant_message = data["choices"][0]["message"]["content"]
-        
-        logger.info(f"Received response ({len(assistant_message)} chars)")
-        
-        return assistant_message.strip()
-    
-    except requests.exceptions.RequestException as e:
-        logger.error(f"API request failed: {e}")
-        return f"Error calling LLM: {e}"
-    
-    except (KeyError, IndexError) as e:
-        logger.error(f"Unexpected API response format: {e}")
-        return "Error: Unexpected response from LLM"
+    return headers, payload
 
 
 # ============================================================================
@@ -324,7 +474,7 @@ def is_online() -> bool:
         bool: True if online, False otherwise
     """
     try:
-        response = requests.get("https://openrouter.ai", timeout=3)
+        response = _get_session().get("https://openrouter.ai", timeout=3)
         return response.status_code == 200
     except:
         return False
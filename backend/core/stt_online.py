@@ -3,13 +3,31 @@ STT Online - Online Speech-to-Text
 Uses Groq Whisper API or OpenAI Whisper API for cloud-based transcription.
 """
 
+import io
 import os
+import struct
 import logging
+import contextlib
 import requests
-from typing import Optional
+from typing import Optional, Union, BinaryIO
 
 logger = logging.getLogger(__name__)
 
+GROQ_BASE_URL = "https://api.groq.com"
+
+# Shared HTTP session so Groq requests reuse one keep-alive TLS connection
+_session: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    """Get or create the shared HTTP session"""
+    global _session
+    
+    if _session is None:
+        _session = requests.Session()
+    
+    return _session
+
 
 def _get_groq_api_key() -> str:
     """Get Groq API key from environment"""
@@ -24,12 +42,13 @@ def _get_groq_api_key() -> str:
     return api_key
 
 
-def transcribe_online(audio_file_path: str, language: str = None) -> dict:
+def transcribe_online(audio_file_path: Union[str, BinaryIO], language: str = None) -> dict:
     """
     Transcribe audio file using Groq Whisper API with automatic language detection.
     
     Args:
-        audio_file_path: Path to audio file
+        audio_file_path: Path to audio file, or a file-like object (e.g. an
+            in-memory io.BytesIO WAV) which is uploaded from its start
         language: Language code (None = auto-detect, "en" = English, "hi" = Hindi)
     
     Returns:
@@ -47,10 +66,18 @@ def transcribe_online(audio_file_path: str, language: str = None) -> dict:
           -F "model=whisper-large-v3" \
           (no language param = auto-detect)
     """
-    if not os.path.exists(audio_file_path):
+    is_path = isinstance(audio_file_path, (str, os.PathLike))
+    
+    if is_path and not os.path.exists(audio_file_path):
         raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
     
-    logger.info(f"Transcribing {audio_file_path} using Groq Whisper API")
+    if is_path:
+        file_name = os.path.basename(audio_file_path)
+    else:
+        file_name = os.path.basename(getattr(audio_file_path, "name", "audio.wav"))
+        audio_file_path.seek(0)
+    
+    logger.info(f"Transcribing {file_name} using Groq Whisper API")
     
     try:
         api_key = _get_groq_api_key()
@@ -59,16 +86,21 @@ def transcribe_online(audio_file_path: str, language: str = None) -> dict:
         return f"[API key error: {e}]"
     
     # Groq Whisper API endpoint
-    url = "https://api.groq.com/openai/v1/audio/transcriptions"
+    url = f"{GROQ_BASE_URL}/openai/v1/audio/transcriptions"
     
     headers = {
         "Authorization": f"Bearer {api_key}"
     }
     
-    # Prepare file upload
-    with open(audio_file_path, "rb") as audio_file:
+    # Prepare file upload (in-memory buffers are used as-is, not closed)
+    if is_path:
+        audio_context = open(audio_file_path, "rb")
+    else:
+        audio_context = contextlib.nullcontext(audio_file_path)
+    
+    with audio_context as audio_file:
         files = {
-            "file": (os.path.basename(audio_file_path), audio_file, "audio/mpeg")
+            "file": (file_name, audio_file, "audio/mpeg")
         }
         
         # Build data dict - only include language if specified
@@ -87,7 +119,7 @@ def transcribe_online(audio_file_path: str, language: str = None) -> dict:
         try:
             logger.info("Sending request to Groq API...")
             
-            response = requests.post(
+            response = _get_session().post(
                 url,
                 headers=headers,
                 files=files,
@@ -125,6 +157,37 @@ def transcribe_online(audio_file_path: str, language: str = None) -> dict:
             }
 
 
+def wav_header(data_size: int, rate: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """Build the 44-byte RIFF/WAVE header for `data_size` bytes of PCM"""
+    byte_rate = rate * channels * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, rate, byte_rate, channels * sample_width, sample_width * 8,
+        b"data", data_size
+    )
+
+
+def transcribe_bytes(pcm: bytes, rate: int = 16000, language: str = None) -> dict:
+    """
+    Transcribe raw 16-bit mono PCM without writing a WAV file.
+    
+    Args:
+        pcm: Raw little-endian int16 samples (bytes, bytearray or memoryview)
+        rate: Sample rate of the PCM in Hz
+        language: Language code (None = auto-detect)
+    
+    Returns:
+        dict: {"text": str, "language": str} (same as transcribe_online)
+    """
+    audio = io.BytesIO()
+    audio.write(wav_header(len(pcm), rate))
+    audio.write(pcm)
+    audio.name = "speech.wav"
+    
+    return transcribe_online(audio, language)
+
+
 def transcribe_with_openai(audio_file_path: str, language: str = "en") -> str:
     """
     Alternative: Transcribe using OpenAI Whisper API.
@@ -166,7 +229,7 @@ def transcribe_with_openai(audio_file_path: str, language: str = "en") -> str:
         }
         
         try:
-            response = requests.post(
+            response = _get_session().post(
                 url,
                 headers=headers,
                 files=files,
@@ -192,6 +255,24 @@ def transcribe_with_openai(audio_file_path: str, language: str = "en") -> str:
 # UTILITIES
 # ============================================================================
 
+def prewarm() -> bool:
+    """
+    Open the Groq connection (DNS + TCP + TLS) ahead of a transcription.
+    
+    Call from a background thread while audio is still being prepared;
+    the next transcribe_online() call then reuses the warm connection.
+    
+    Returns:
+        bool: True if Groq was reached, False otherwise
+    """
+    try:
+        _get_session().head(GROQ_BASE_URL, timeout=3)
+        return True
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"Groq prewarm failed: {e}")
+        return False
+
+
 def is_online() -> bool:
     """
     Check if we can reach Groq API.
@@ -200,7 +281,7 @@ def is_online() -> bool:
         bool: True if online, False otherwise
     """
     try:
-        response = requests.get("https://api.groq.com", timeout=3)
+        response = _get_session().get(GROQ_BASE_URL, timeout=3)
         return response.status_code in [200, 404]  # 404 is OK (root endpoint doesn't exist)
     except:
         return False
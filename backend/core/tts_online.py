@@ -33,6 +33,8 @@ try:
     import pygame
     pygame.mixer.init()
     PYGAME_AVAILABLE = True
+    # Posted by mixer.music when a track finishes (see open_playback)
+    MUSIC_END = pygame.USEREVENT + 1
 except ImportError:
     logger.warning("pygame not installed. Install with: pip install pygame")
     PYGAME_AVAILABLE = False
@@ -219,6 +221,28 @@ def play_audio(audio_path: str):
         logger.error(f"Audio playback failed: {e}")
 
 
+def open_playback(frequency: int = 24000, buffer: int = 512):
+    """
+    Reopen the mixer for low-latency replies and enable MUSIC_END.
+    
+    24 kHz matches Edge TTS output and the small buffer keeps playback
+    start latency low. The end event needs pygame's event queue, so
+    pygame.init() runs too (the mixer settings are kept).
+    """
+    pygame.mixer.quit()
+    pygame.mixer.init(frequency=frequency, buffer=buffer)
+    pygame.init()
+    pygame.mixer.music.set_endevent(MUSIC_END)
+
+
+def play_until_end(audio_path: str):
+    """Play an audio file on the mixer set up by open_playback and wait for MUSIC_END"""
+    pygame.mixer.music.load(audio_path)
+    pygame.mixer.music.play()
+    while pygame.event.wait().type != MUSIC_END:
+        pass
+
+
 def cleanup_temp_audio(audio_path: str):
     """
     Delete temporary audio file.
@@ -100,6 +100,50 @@ def split_into_sentences(text: str) -> List[str]:
     return result
 
 
+# Sentence-final punctuation followed by whitespace (a decimal point never is)
+_SENTENCE_BOUNDARY = re.compile(r'[.!?।]+(?=\s)')
+_ABBREVIATIONS = ('mr.', 'mrs.', 'dr.', 'etc.', 'e.g.', 'i.e.')
+
+
+class SentenceBuffer:
+    """
+    Turns a streamed LLM reply into sentences as soon as each one is complete.
+    
+    Example:
+        buffer = SentenceBuffer()
+        for chunk in brain.stream_command(text):
+            for sentence in buffer.feed(chunk):
+                speak(sentence)
+        speak(buffer.flush())
+    """
+    
+    MIN_LENGTH = 10  # Shorter fragments are joined with the next sentence
+    
+    def __init__(self):
+        self._text = ""
+    
+    def feed(self, chunk: str) -> List[str]:
+        """Add a streamed chunk; returns the sentences it completed"""
+        self._text += chunk
+        sentences = []
+        start = 0
+        
+        for match in _SENTENCE_BOUNDARY.finditer(self._text):
+            sentence = self._text[start:match.end()].strip()
+            if len(sentence) < self.MIN_LENGTH or sentence.lower().endswith(_ABBREVIATIONS):
+                continue
+            sentences.append(sentence)
+            start = match.end()
+        
+        self._text = self._text[start:]
+        return sentences
+    
+    def flush(self) -> str:
+        """Return whatever is left once the stream ends, and clear the buffer"""
+        rest, self._text = self._text.strip(), ""
+        return rest
+
+
 # ============================================================================
 # ASYNC AUDIO GENERATION
 # ============================================================================
@@ -30,6 +30,12 @@ except ImportError:
 # Global scheduler
 _scheduler: Optional[BackgroundScheduler] = None
 
+# Alarm parsing patterns (compiled once at import)
+_RELATIVE_TIME_RE = re.compile(r"in (\d+) (minute|hour)s?")
+_RELATIVE_DESC_RE = re.compile(r"(?:remind me to|for) (.+?) in")
+_CLOCK_TIME_RE = re.compile(r"(?:at|for)\s+(\d{1,2}):?(\d{2})?\s*(am|pm)?")
+_DESCRIPTION_RE = re.compile(r"(?:to |for )(.+?)(?:at|in|$)")
+
 
 def _get_scheduler():
     """Get or create scheduler instance"""
@@ -136,7 +142,7 @@ def parse_alarm_from_text(text: str) -> tuple:
     description = "alarm"
     
     # Pattern: "in X minutes/hours"
-    match = re.search(r"in (\d+) (minute|hour)s?", text)
+    match = _RELATIVE_TIME_RE.search(text)
     if match:
         value = int(match.group(1))
         unit = match.group(2)
@@ -147,12 +153,12 @@ def parse_alarm_from_text(text: str) -> tuple:
             scheduled_time = datetime.now() + timedelta(hours=value)
         
         # Extract description
-        desc_match = re.search(r"(?:remind me to|for) (.+?) in", text)
+        desc_match = _RELATIVE_DESC_RE.search(text)
         if desc_match:
             description = desc_match.group(1)
     
     # Pattern: "at HH:MM" or "for HH:MM" or "at Hpm/am"
-    match = re.search(r"(?:at|for)\s+(\d{1,2}):?(\d{2})?\s*(am|pm)?", text)
+    match = _CLOCK_TIME_RE.search(text)
     if match and not scheduled_time:
         hour = int(match.group(1))
         minute = int(match.group(2)) if match.group(2) else 0
@@ -183,7 +189,7 @@ def parse_alarm_from_text(text: str) -> tuple:
     # Extract description if not already set
     if description == "alarm":
         # Try to find "to do X" or "for X"
-        desc_match = re.search(r"(?:to |for )(.+?)(?:at|in|$)", text)
+        desc_match = _DESCRIPTION_RE.search(text)
         if desc_match:
             description = desc_match.group(1).strip()
     
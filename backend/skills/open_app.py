@@ -6,6 +6,7 @@ Works for ANY installed application on ANY Windows PC.
 
 import os
 import logging
+import functools
 import subprocess
 import platform
 import webbrowser
@@ -91,6 +92,12 @@ class SmartAppLauncher:
         # Add more as needed
     }
     
+    # Start Menu shortcut folders (all users + current user)
+    START_MENU_DIRS = (
+        "%PROGRAMDATA%\\Microsoft\\Windows\\Start Menu\\Programs",
+        "%APPDATA%\\Microsoft\\Windows\\Start Menu\\Programs",
+    )
+    
     # Common folders with environment variables
     FOLDER_PATHS = {
         "downloads": "%USERPROFILE%\\Downloads",
@@ -142,17 +149,7 @@ class SmartAppLauncher:
                 )
                 logger.info(f"✓ Opened '{app_name}' via Store AppID")
                 
-                if MONGO_AVAILABLE:
-                    try:
-                        mongo_manager.save_app_command({
-                            "command_type": "open_app",
-                            "target": app_name,
-                            "user_query": f"open {original_name}",
-                            "success": True,
-                            "method": "store_app"
-                        })
-                    except:
-                        pass
+                SmartAppLauncher._save_command(app_name, original_name, "store_app")
                 
                 return {
                     "success": True,
@@ -162,7 +159,24 @@ class SmartAppLauncher:
             except Exception as e:
                 logger.debug(f"Store app failed for '{app_name}': {e}")
         
-        # Method 2: Windows Start Menu (BEST - works 95% of time)
+        # Method 2: Start Menu shortcut (indexed once, then a dict lookup)
+        shortcut = SmartAppLauncher.find_shortcut(original_name) or SmartAppLauncher.find_shortcut(app_name)
+        if shortcut:
+            logger.info(f"Attempting to open '{app_name}' via shortcut {shortcut}...")
+            try:
+                os.startfile(shortcut)
+                logger.info(f"✓ Opened '{app_name}' via Start Menu shortcut")
+                SmartAppLauncher._save_command(app_name, original_name, "start_menu")
+                
+                return {
+                    "success": True,
+                    "message": f"Opened {app_name.title()}",
+                    "method": "start_menu"
+                }
+            except Exception as e:
+                logger.debug(f"Shortcut failed for '{app_name}': {e}")
+        
+        # Method 3: Windows 'start' command (App Paths registry + PATH)
         logger.info(f"Attempting to open '{app_name}' using Windows Start Menu...")
         try:
             # Use 'start ""' to prevent issues with app names containing spaces
@@ -178,17 +192,7 @@ class SmartAppLauncher:
                 logger.info(f"✓ Opened '{app_name}' via Start Menu")
                 
                 # Save to MongoDB for learning
-                if MONGO_AVAILABLE:
-                    try:
-                        mongo_manager.save_app_command({
-                            "command_type": "open_app",
-                            "target": app_name,
-                            "user_query": f"open {original_name}",
-                            "success": True,
-                            "method": "start_menu"
-                        })
-                    except:
-                        pass
+                SmartAppLauncher._save_command(app_name, original_name, "start_menu")
                 
                 return {
                     "success": True,
@@ -200,7 +204,7 @@ class SmartAppLauncher:
         except Exception as e:
             logger.debug(f"Start Menu failed for '{app_name}': {e}")
         
-        # Method 3: Protocol handlers (for special apps)
+        # Method 4: Protocol handlers (for special apps)
         if app_name in SmartAppLauncher.PROTOCOLS:
             logger.info(f"Attempting to open '{app_name}' using protocol handler...")
             try:
@@ -215,7 +219,7 @@ class SmartAppLauncher:
             except Exception as e:
                 logger.debug(f"Protocol failed for '{app_name}': {e}")
         
-        # Method 4: Direct .exe (for system apps)
+        # Method 5: Direct .exe (for system apps)
         logger.info(f"Attempting to open '{app_name}.exe' directly...")
         try:
             subprocess.Popen([f'{app_name}.exe'])
@@ -237,6 +241,38 @@ class SmartAppLauncher:
             "method": None
         }
     
+    @staticmethod
+    def find_shortcut(app_name: str) -> Optional[str]:
+        """
+        Look up a Start Menu shortcut by its display name (case-insensitive).
+        
+        The index is rebuilt only when a Start Menu folder's mtime changes,
+        so repeated lookups in a session cost one stat per folder.
+        """
+        dirs = tuple(
+            path for path in (os.path.expandvars(d) for d in SmartAppLauncher.START_MENU_DIRS)
+            if os.path.isdir(path)
+        )
+        stamp = tuple(os.stat(d).st_mtime_ns for d in dirs)
+        return _index_start_menu(dirs, stamp).get(app_name.lower().strip())
+    
+    @staticmethod
+    def _save_command(app_name: str, original_name: str, method: str):
+        """Record a successful launch in MongoDB (for learning user preferences)"""
+        if not MONGO_AVAILABLE:
+            return
+        
+        try:
+            mongo_manager.save_app_command({
+                "command_type": "open_app",
+                "target": app_name,
+                "user_query": f"open {original_name}",
+                "success": True,
+                "method": method
+            })
+        except:
+            pass
+    
     @staticmethod
     def _open_folder(folder_name: str) -> Dict:
         """Open a folder in Explorer"""
@@ -317,6 +353,19 @@ class SmartAppLauncher:
             pass
 
 
+@functools.lru_cache(maxsize=1)
+def _index_start_menu(dirs: tuple, stamp: tuple) -> Dict[str, str]:
+    """Map lowercase shortcut names to .lnk paths (`stamp` only keys the cache)"""
+    shortcuts = {}
+    for start_dir in dirs:
+        for root, _, files in os.walk(start_dir):
+            for file in files:
+                name, ext = os.path.splitext(file)
+                if ext.lower() == ".lnk":
+                    shortcuts.setdefault(name.lower(), os.path.join(root, file))
+    return shortcuts
+
+
 # ============================================================================
 # PUBLIC API (used by brain.py)
 # ============================================================================
@@ -4,6 +4,8 @@ Professional music playback - works like Alexa/Google Home
 """
 
 import os
+import json
+import time
 import logging
 from typing import Optional
 
@@ -13,11 +15,36 @@ logger = logging.getLogger(__name__)
 try:
     import spotipy
     from spotipy.oauth2 import SpotifyOAuth
+    from spotipy.cache_handler import CacheFileHandler
     SPOTIPY_AVAILABLE = True
 except ImportError:
     SPOTIPY_AVAILABLE = False
     logger.warning("Spotipy not installed. Install: pip install spotipy")
 
+# OAuth token and last playback device, kept across runs
+SPOTIFY_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".jarvis")
+SPOTIFY_TOKEN_CACHE = os.path.join(SPOTIFY_CACHE_DIR, "spotify_token.json")
+SPOTIFY_DEVICE_CACHE = os.path.join(SPOTIFY_CACHE_DIR, "spotify_device.json")
+
+
+def _load_device_id() -> Optional[str]:
+    """Read the cached playback device id (None if missing or unreadable)"""
+    try:
+        with open(SPOTIFY_DEVICE_CACHE, encoding="utf-8") as f:
+            return json.load(f).get("device_id")
+    except (OSError, ValueError):
+        return None
+
+
+def _save_device_id(device_id: str):
+    """Write the playback device id cache"""
+    try:
+        os.makedirs(SPOTIFY_CACHE_DIR, exist_ok=True)
+        with open(SPOTIFY_DEVICE_CACHE, "w", encoding="utf-8") as f:
+            json.dump({"device_id": device_id}, f)
+    except OSError as e:
+        logger.warning(f"Could not save Spotify device: {e}")
+
 
 class SpotifyPlayer:
     """Spotify API player - direct control without window automation"""
@@ -26,6 +53,8 @@ class SpotifyPlayer:
         """Initialize Spotify API client"""
         self.sp = None
         self.authenticated = False
+        self.device_id = _load_device_id()
+        self.last_track_uri = None  # Set by search_and_play
         
         if SPOTIPY_AVAILABLE:
             self._setup_client()
@@ -45,16 +74,21 @@ class SpotifyPlayer:
             # Setup OAuth with required scopes
             scope = "user-read-playback-state,user-modify-playback-state"
             
-            self.sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
+            os.makedirs(SPOTIFY_CACHE_DIR, exist_ok=True)
+            cache_handler = CacheFileHandler(cache_path=SPOTIFY_TOKEN_CACHE)
+            auth_manager = SpotifyOAuth(
                 client_id=client_id,
                 client_secret=client_secret,
                 redirect_uri=redirect_uri,
                 scope=scope,
-                cache_path=".spotify_cache"
-            ))
+                cache_handler=cache_handler
+            )
+            self.sp = spotipy.Spotify(auth_manager=auth_manager)
             
-            # Test authentication
-            self.sp.current_user()
+            # A valid (or refreshed) cached token is enough - otherwise test
+            # authentication with a request, which runs the browser flow
+            if not auth_manager.validate_token(cache_handler.get_cached_token()):
+                self.sp.current_user()
             self.authenticated = True
             logger.info("✅ Spotify API authenticated successfully")
             
@@ -72,6 +106,8 @@ class SpotifyPlayer:
         Returns:
             dict: Result with status and track info
         """
+        self.last_track_uri = None
+        
         if not self.authenticated:
             return {
                 'success': False,
@@ -95,21 +131,15 @@ class SpotifyPlayer:
             track_uri = track['uri']
             track_name = track['name']
             artist_name = track['artists'][0]['name']
+            self.last_track_uri = track_uri
             
-            # Get available devices
-            devices = self.sp.devices()
-            
-            if not devices['devices']:
+            if not self._play_on_device([track_uri]):
                 return {
                     'success': False,
                     'message': 'No active Spotify devices found. Open Spotify app first.',
                     'fallback': True
                 }
             
-            # Play on the first available device
-            device_id = devices['devices'][0]['id']
-            self.sp.start_playback(device_id=device_id, uris=[track_uri])
-            
             logger.info(f"✅ Playing: {track_name} by {artist_name}")
             
             return {
@@ -127,6 +157,63 @@ class SpotifyPlayer:
                 'fallback': True
             }
     
+    def _play_on_device(self, uris: list) -> bool:
+        """
+        Start playback on the cached device, or look devices up again.
+        
+        The devices() lookup only runs when there is no cached device id or
+        Spotify reports the cached device as gone (404).
+        
+        Returns:
+            bool: False if no Spotify device is available
+        """
+        if self.device_id:
+            try:
+                self.sp.start_playback(device_id=self.device_id, uris=uris)
+                return True
+            except spotipy.SpotifyException as e:
+                if e.http_status != 404:
+                    raise
+                logger.info("Cached Spotify device not found - looking up devices")
+        
+        devices = self.sp.devices()
+        if not devices['devices']:
+            return False
+        
+        # Play on the first available device
+        self.device_id = devices['devices'][0]['id']
+        _save_device_id(self.device_id)
+        self.sp.start_playback(device_id=self.device_id, uris=uris)
+        return True
+    
+    def wait_until_playing(self, track_uri: Optional[str] = None, timeout: float = 5.0, interval: float = 0.2) -> bool:
+        """
+        Poll current playback until the track is playing.
+        
+        Args:
+            track_uri: Track to wait for (default: the last one search_and_play started)
+            timeout: Seconds to wait before giving up
+            interval: Seconds between current_playback() polls
+        
+        Returns:
+            bool: True once the track is playing, False on timeout
+        """
+        track_uri = track_uri or self.last_track_uri
+        deadline = time.monotonic() + timeout
+        
+        while True:
+            try:
+                playback = self.sp.current_playback()
+            except Exception as e:
+                logger.debug(f"Playback poll failed: {e}")
+                playback = None
+            
+            if playback and playback.get('is_playing') and (playback.get('item') or {}).get('uri') == track_uri:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+    
     def pause(self) -> bool:
         """Pause current playback"""
         try:
@@ -17,11 +17,15 @@ import sys
 import wave
 import pyaudio
 import time
-import struct
 import threading
 import msvcrt  # For keyboard interrupt detection on Windows
 from dotenv import load_dotenv
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Add backend to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -29,18 +33,30 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv('backend/.env')
 
 from backend.core import stt_online, brain, tts_manager, tts_online, mongo_manager
+from backend.core.audio_io import rms_energy
 
 # Audio configuration
 CHUNK = 1024
 FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 16000
+MAX_RECORD_SECONDS = 30  # Size of the preallocated capture buffer
 
 # Global thresholds (set by calibration)
 SPEECH_THRESHOLD = 230
 SILENCE_THRESHOLD = 150
 
 
+def chunk_energies(pcm):
+    """RMS energy of every CHUNK-sized block of a raw int16 buffer, in one pass"""
+    if np is None:
+        step = CHUNK * 2
+        return [rms_energy(pcm[i:i + step]) for i in range(0, len(pcm), step)]
+    
+    blocks = np.frombuffer(pcm, dtype=np.int16).reshape(-1, CHUNK).astype(np.int32)
+    return np.sqrt(np.mean(blocks * blocks, axis=1)).astype(int).tolist()
+
+
 # ============================================================================
 # NOISE CALIBRATION
 # ============================================================================
@@ -69,12 +85,13 @@ def auto_calibrate_noise(audio, duration=3):
         frames_per_buffer=CHUNK
     )
     
-    frames = []
     total_chunks = int(RATE / CHUNK * duration)
+    chunk_bytes = CHUNK * audio.get_sample_size(FORMAT)
+    pcm = bytearray(total_chunks * chunk_bytes)
     
     for i in range(total_chunks):
         data = stream.read(CHUNK, exception_on_overflow=False)
-        frames.append(data)
+        pcm[i * chunk_bytes:(i + 1) * chunk_bytes] = data
         
         # Show progress
         if i % 5 == 0:
@@ -87,11 +104,7 @@ def auto_calibrate_noise(audio, duration=3):
     stream.close()
     
     # Advanced statistical analysis of ambient noise
-    energies = []
-    for frame in frames:
-        samples = struct.unpack(f"{len(frame)//2}h", frame)
-        energy = int((sum(s**2 for s in samples) / len(samples))**0.5)
-        energies.append(energy)
+    energies = chunk_energies(pcm)
     
     avg_energy = int(sum(energies) / len(energies))
     max_energy = max(energies)
@@ -195,8 +208,7 @@ def record_command(audio, speech_threshold, silence_threshold, min_speech_chunks
         
         while time.time() - start < 5:
             data = stream.read(CHUNK, exception_on_overflow=False)
-            samples = struct.unpack(f"{len(data)//2}h", data)
-            energy = int((sum(s**2 for s in samples) / len(samples))**0.5)
+            energy = rms_energy(data)
             max_seen = max(max_seen, energy)
             
             bar = "█" * min(50, energy // 10)
@@ -230,7 +242,9 @@ def record_command(audio, speech_threshold, silence_threshold, min_speech_chunks
         frames_per_buffer=CHUNK
     )
     
-    frames = []
+    # One buffer for the whole command, filled at a moving offset
+    recorded = bytearray(RATE * MAX_RECORD_SECONDS * audio.get_sample_size(FORMAT))
+    pos = 0
     silence_chunks = 0
     max_silence = 24  # ~1.5 seconds at 16kHz
     speech_chunks_count = 0
@@ -249,8 +263,7 @@ def record_command(audio, speech_threshold, silence_threshold, min_speech_chunks
         data = stream.read(CHUNK, exception_on_overflow=False)
         
         # Calculate energy
-        samples = struct.unpack(f"{len(data)//2}h", data)
-        raw_energy = int((sum(s**2 for s in samples) / len(samples))**0.5)
+        raw_energy = rms_energy(data)
         
         # Smooth energy to reduce fan noise fluctuations
         energy_history.append(raw_energy)
@@ -276,14 +289,19 @@ def record_command(audio, speech_threshold, silence_threshold, min_speech_chunks
         if not started and energy > speech_threshold:
             started = True
             recording = True
-            frames = [data]
+            recorded[:len(data)] = data
+            pos = len(data)
             silence_chunks = 0
             speech_chunks_count = 1
             continue
         
         # Continue recording
         if recording:
-            frames.append(data)
+            if pos + len(data) > len(recorded):
+                print(f"\n\n⏱️  {MAX_RECORD_SECONDS}s limit reached - stopping...")
+                break
+            recorded[pos:pos + len(data)] = data
+            pos += len(data)
             
             # Count strong speech chunks
             if energy > speech_threshold:
@@ -302,7 +320,7 @@ def record_command(audio, speech_threshold, silence_threshold, min_speech_chunks
                         print(f"\n   ⚠️  Too short ({speech_chunks_count} chunks, need {min_speech_chunks}) - resetting...\n")
                         started = False
                         recording = False
-                        frames = []
+                        pos = 0
                         silence_chunks = 0
                         speech_chunks_count = 0
             else:
@@ -322,7 +340,7 @@ def record_command(audio, speech_threshold, silence_threshold, min_speech_chunks
     wf.setnchannels(CHANNELS)
     wf.setsampwidth(audio.get_sample_size(FORMAT))
     wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
+    wf.writeframes(memoryview(recorded)[:pos])
     wf.close()
     
     return filename
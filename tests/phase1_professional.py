@@ -10,12 +10,18 @@ Implements:
 ✅ Clean audio pipeline → Groq STT → Qwen → Edge TTS
 """
 
+import atexit
+import io
 import os
+import re
 import sys
+import tempfile
 import wave
 import numpy as np
 import time
 import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Add backend to path
@@ -51,33 +57,144 @@ except ImportError:
     print("   Install: pip install pydub")
     AudioSegment = None
 
+try:
+    import soundfile as sf
+    print("✅ soundfile available")
+except ImportError:
+    print("⚠️  soundfile not found - using the wave module for WAV I/O")
+    print("   Install: pip install soundfile")
+    sf = None
+
+try:
+    from numba import njit, types
+    print("✅ numba available")
+except ImportError:
+    print("⚠️  numba not found - energy gate runs in pure Python")
+    print("   Install: pip install numba")
+    njit = None
+
 import pyaudio
 
 # Audio configuration (ChatGPT recommended)
 RATE = 16000  # 16kHz for STT models
 CHANNELS = 1  # Mono (stereo adds confusion)
-CHUNK_DURATION_MS = 30  # 30ms chunks for WebRTC VAD
-CHUNK = int(RATE * CHUNK_DURATION_MS / 1000)  # 480 samples
+CHUNK_DURATION_MS = 20  # 20ms chunks (most accurate WebRTC VAD frame size)
+CHUNK = RATE * CHUNK_DURATION_MS // 1000  # 320 samples
 FORMAT = pyaudio.paInt16
 
+assert CHUNK_DURATION_MS in (10, 20, 30), "WebRTC VAD only accepts 10/20/30ms frames"
+assert CHUNK * 1000 == RATE * CHUNK_DURATION_MS, "CHUNK must be a whole number of samples"
+
 # VAD settings
 VAD_MODE = 3  # 0-3, 3=most aggressive (best for noisy environments)
-SPEECH_CONSECUTIVE_CHUNKS = 10  # Need 10 chunks (300ms) of speech to START
-SILENCE_CONSECUTIVE_CHUNKS = 20  # Need 20 chunks (600ms) of silence to STOP
+SPEECH_CONSECUTIVE_CHUNKS = 15  # Need 15 chunks (300ms) of speech to START
+SILENCE_CONSECUTIVE_CHUNKS = 30  # Need 30 chunks (600ms) of silence to STOP
 MAX_RECORDING_SECONDS = 10  # Auto-stop after 10 seconds
+SEGMENT_PAUSE_CHUNKS = 10  # A 200ms pause inside speech splits off a segment
+MIN_SEGMENT_SECONDS = 2  # Only send segments of at least 2s to STT early
+ENERGY_GATE = 300  # Peak amplitude below this is silence (skip WebRTC VAD)
+UI_REFRESH_SECONDS = 0.1  # Redraw the status line at most 10x per second
+CLEAN_SKIP_SNR_DB = 20  # Recordings above this SNR skip denoise/normalize
+
+
+# ============================================================================
+# ENERGY GATE
+# ============================================================================
+
+def _chunk_energy(samples):
+    """Peak absolute amplitude of an int16 chunk."""
+    peak = 0
+    for v in samples:
+        a = abs(np.int32(v))
+        if a > peak:
+            peak = a
+    return np.float32(peak)
+
+
+if njit is not None:
+    # Eagerly compiled for contiguous read-only int16 (np.frombuffer of a chunk)
+    _INT16_CHUNK = types.Array(types.int16, 1, 'C', readonly=True)
+    chunk_energy = njit(
+        types.float32(_INT16_CHUNK),
+        cache=True, fastmath=True, boundscheck=False, error_model='numpy'
+    )(_chunk_energy)
+else:
+    def chunk_energy(samples):
+        """Peak absolute amplitude of an int16 chunk (numpy fallback)."""
+        return np.float32(np.abs(samples.astype(np.int32)).max())
 
 
 # ============================================================================
 # WEBRTC VAD RECORDING
 # ============================================================================
 
-def record_with_vad():
+# Shared PyAudio instance (PortAudio init/teardown is slow, do it once)
+_audio = None
+
+
+def _get_audio():
+    """Get or create the shared PyAudio instance"""
+    global _audio
+    
+    if _audio is None:
+        _audio = pyaudio.PyAudio()
+        atexit.register(_audio.terminate)
+    
+    return _audio
+
+
+def save_wav(target, pcm):
+    """Write 16-bit mono PCM bytes as WAV to a path or file-like object"""
+    wf = wave.open(target, 'wb')
+    wf.setnchannels(CHANNELS)
+    wf.setsampwidth(2)  # 16-bit
+    wf.setframerate(RATE)
+    wf.writeframes(pcm)
+    wf.close()
+
+
+# Ready beep, rendered once to a WAV so it can play asynchronously
+# (winsound cannot play SND_MEMORY sounds with SND_ASYNC)
+BEEP_FREQUENCY = 1000  # Hz
+BEEP_SECONDS = 0.1
+_beep_file = None
+
+
+def _get_beep_file():
+    """Get or render the ready-beep WAV file"""
+    global _beep_file
+    
+    if _beep_file is None:
+        t = np.arange(int(RATE * BEEP_SECONDS)) / RATE
+        tone = (np.sin(2 * np.pi * BEEP_FREQUENCY * t) * 0.5 * 32767).astype(np.int16)
+        _beep_file = os.path.join(tempfile.gettempdir(), "jarvis_ready_beep.wav")
+        save_wav(_beep_file, tone)
+    
+    return _beep_file
+
+
+def estimate_snr_db(speech_power, speech_count, noise_power, noise_count):
+    """SNR in dB from summed per-chunk mean power of VAD-labelled chunks"""
+    if speech_count == 0 or noise_count == 0:
+        return 0.0
+    speech = speech_power / speech_count
+    noise = max(noise_power / noise_count, 1.0)
+    return float(10 * np.log10(max(speech, 1.0) / noise))
+
+
+def record_with_vad(on_segment=None):
     """
     Record using WebRTC VAD (Voice Activity Detection).
     This is the PROFESSIONAL way used by Google Meet, Zoom, etc.
     
+    Args:
+        on_segment: Optional callback receiving PCM bytes and SNR (dB) of
+            finished segments (split at pauses) while recording continues,
+            so STT can start before the utterance ends
+    
     Returns:
-        audio_file: Path to recorded WAV file
+        tuple: (audio_buffer, snr_db) - in-memory WAV (io.BytesIO, audio
+            after the last segment) and estimated SNR, or (None, None)
     """
     print("\n🔴 Press ENTER when ready to speak...")
     input()
@@ -86,16 +203,15 @@ def record_with_vad():
     print("   Will auto-start when you speak")
     print("   Will auto-stop after 600ms silence\n")
     
-    # Beep to indicate ready
+    # Beep to indicate ready (non-blocking, listening starts immediately)
     import winsound
-    winsound.Beep(1000, 100)
+    winsound.PlaySound(_get_beep_file(), winsound.SND_FILENAME | winsound.SND_ASYNC)
     
     # Initialize WebRTC VAD
     vad = webrtcvad.Vad(VAD_MODE)
     
-    # Initialize PyAudio
-    audio = pyaudio.PyAudio()
-    stream = audio.open(
+    # Open input stream on the shared PyAudio instance
+    stream = _get_audio().open(
         format=FORMAT,
         channels=CHANNELS,
         rate=RATE,
@@ -103,11 +219,19 @@ def record_with_vad():
         frames_per_buffer=CHUNK
     )
     
-    frames = []
+    # Preallocated capture buffer (max duration + one spare chunk)
+    chunk_bytes = CHUNK * 2  # 16-bit mono
+    max_chunks = int(RATE / CHUNK * MAX_RECORDING_SECONDS) + 1
+    buffer = bytearray(max_chunks * chunk_bytes)
+    pos = 0
+    segment_start = 0
     recording = False
     speech_chunks = 0
     silence_chunks = 0
     total_chunks = 0
+    last_ui = 0.0
+    speech_power = noise_power = 0.0
+    speech_count = noise_count = 0
     
     print("   ⏳ Waiting for speech...\n")
     
@@ -117,31 +241,66 @@ def record_with_vad():
             data = stream.read(CHUNK, exception_on_overflow=False)
             total_chunks += 1
             
-            # WebRTC VAD detection (True = speech, False = silence)
-            is_speech = vad.is_speech(data, RATE)
+            # Energy gate: obvious silence never reaches WebRTC VAD.
+            # Zero-copy: the int16 view and vad.is_speech both read `data`
+            # in place (the webrtcvad binding takes the bytes pointer as-is)
+            samples = np.frombuffer(data, dtype=np.int16)
+            if chunk_energy(samples) < ENERGY_GATE:
+                is_speech = False
+            else:
+                # WebRTC VAD detection (True = speech, False = silence)
+                is_speech = vad.is_speech(data, RATE)
+            
+            # Accumulate power per label for the SNR estimate
+            power = float(np.mean(np.square(samples, dtype=np.float64)))
+            if is_speech:
+                speech_power += power
+                speech_count += 1
+            else:
+                noise_power += power
+                noise_count += 1
+            
+            paused_chunks = silence_chunks
             
             # Visual feedback
             if is_speech:
-                print(f"\r   🎤 SPEECH detected! Recording... [{len(frames)} chunks]", end="", flush=True)
+                status = f"\r   🎤 SPEECH detected! Recording... [{pos // chunk_bytes} chunks]"
                 speech_chunks += 1
                 silence_chunks = 0
             else:
                 if recording:
-                    print(f"\r   ⏸️  Silence... [{silence_chunks}/{SILENCE_CONSECUTIVE_CHUNKS}]     ", end="", flush=True)
+                    status = f"\r   ⏸️  Silence... [{silence_chunks}/{SILENCE_CONSECUTIVE_CHUNKS}]     "
                 else:
-                    print(f"\r   ⏳ Waiting... [{speech_chunks}/{SPEECH_CONSECUTIVE_CHUNKS}]     ", end="", flush=True)
+                    status = f"\r   ⏳ Waiting... [{speech_chunks}/{SPEECH_CONSECUTIVE_CHUNKS}]     "
                 silence_chunks += 1
                 speech_chunks = 0
             
+            # Throttled so console writes don't stall audio capture
+            now = time.monotonic()
+            if now - last_ui >= UI_REFRESH_SECONDS:
+                print(status, end="", flush=True)
+                last_ui = now
+            
             # Start recording after sustained speech
             if not recording and speech_chunks >= SPEECH_CONSECUTIVE_CHUNKS:
                 print(f"\n\n   ✅ Speech started! Recording...\n")
                 recording = True
-                frames = []  # Clear any pre-speech buffer
+                pos = 0  # Clear any pre-speech buffer
             
             # Add frame if recording
             if recording:
-                frames.append(data)
+                # Speech resumed after a pause: hand off the finished segment
+                if (on_segment is not None and is_speech
+                        and paused_chunks >= SEGMENT_PAUSE_CHUNKS
+                        and pos - segment_start >= MIN_SEGMENT_SECONDS * RATE * 2):
+                    on_segment(
+                        bytes(buffer[segment_start:pos]),
+                        estimate_snr_db(speech_power, speech_count, noise_power, noise_count)
+                    )
+                    segment_start = pos
+                
+                buffer[pos:pos + len(data)] = data
+                pos += len(data)
             
             # Stop recording after sustained silence
             if recording and silence_chunks >= SILENCE_CONSECUTIVE_CHUNKS:
@@ -157,55 +316,95 @@ def record_with_vad():
         print("\n\n   ⚠️  Recording cancelled\n")
         stream.stop_stream()
         stream.close()
-        audio.terminate()
-        return None
+        return None, None
     
     stream.stop_stream()
     stream.close()
-    audio.terminate()
     
     # Check if we got any audio
-    if not frames:
+    if pos == 0:
         print("   ❌ No speech detected!")
-        return None
+        return None, None
     
-    print(f"   ✅ Recorded {len(frames)} chunks ({len(frames) * CHUNK_DURATION_MS / 1000:.1f}s)")
+    recorded_chunks = pos // chunk_bytes
+    snr_db = estimate_snr_db(speech_power, speech_count, noise_power, noise_count)
+    print(f"   ✅ Recorded {recorded_chunks} chunks ({recorded_chunks * CHUNK_DURATION_MS / 1000:.1f}s, SNR {snr_db:.1f} dB)")
     
-    # Save raw audio
-    temp_file = "temp_raw_audio.wav"
-    wf = wave.open(temp_file, 'wb')
-    wf.setnchannels(CHANNELS)
-    wf.setsampwidth(audio.get_sample_size(FORMAT))
-    wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
-    wf.close()
+    # Keep raw audio in memory as WAV
+    audio_buffer = io.BytesIO()
+    save_wav(audio_buffer, memoryview(buffer)[segment_start:pos])
     
-    return temp_file
+    return audio_buffer, snr_db
 
 
 # ============================================================================
 # AUDIO CLEANING
 # ============================================================================
 
-def clean_audio(input_file):
+# Reused int16 output buffers (one per thread, segments clean concurrently)
+_out_buffers = threading.local()
+
+
+def _to_int16(samples):
+    """Clip samples into a reused int16 buffer instead of allocating a copy"""
+    # Already int16 (e.g. noisereduce unavailable): nothing to convert
+    if samples.dtype == np.int16:
+        return np.ascontiguousarray(samples)
+    
+    buf = getattr(_out_buffers, "buf", None)
+    if buf is None or len(buf) < len(samples):
+        buf = np.empty(max(len(samples), MAX_RECORDING_SECONDS * RATE), dtype=np.int16)
+        _out_buffers.buf = buf
+    
+    out = buf[:len(samples)]
+    np.clip(samples, -32768, 32767, out=out, casting='unsafe')
+    return out
+
+
+def _read_wav(source):
+    """Read an in-memory 16-bit mono WAV into an int16 array"""
+    source.seek(0)
+    if sf is not None:
+        samples, _ = sf.read(source, dtype='int16')
+        return samples
+    
+    wf = wave.open(source, 'rb')
+    samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    wf.close()
+    return samples
+
+
+def _write_wav(samples):
+    """Write samples to a new in-memory 16-bit mono WAV"""
+    target = io.BytesIO()
+    if sf is not None:
+        sf.write(target, _to_int16(samples), RATE, format='WAV', subtype='PCM_16')
+    else:
+        save_wav(target, _to_int16(samples))
+    target.seek(0)
+    return target
+
+
+def clean_audio(input_file, snr_db=None):
     """
     Clean audio using noise reduction and normalization.
     This is what makes STT work reliably!
     
     Args:
-        input_file: Path to raw audio file
+        input_file: Raw audio as in-memory WAV (io.BytesIO)
+        snr_db: Estimated SNR from record_with_vad; clean input is passed through
         
     Returns:
-        clean_file: Path to cleaned audio file
+        clean_file: Cleaned audio as in-memory WAV (io.BytesIO)
     """
+    if snr_db is not None and snr_db > CLEAN_SKIP_SNR_DB:
+        print(f"\n🧹 Audio already clean (SNR {snr_db:.1f} dB) - skipping cleanup\n")
+        return input_file
+    
     print("\n🧹 Cleaning audio...")
     
     # Read audio file
-    wf = wave.open(input_file, 'rb')
-    audio_data = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
-    wf.close()
-    
-    cleaned_data = audio_data
+    cleaned_data = _read_wav(input_file)
     
     # Step 1: Noise reduction (if available)
     if nr is not None:
@@ -222,59 +421,61 @@ def clean_audio(input_file):
     if AudioSegment is not None:
         print("   🔊 Normalizing volume...")
         
-        # Save temp file for pydub
-        temp_np = "temp_np.wav"
-        wf = wave.open(temp_np, 'wb')
-        wf.setnchannels(CHANNELS)
-        wf.setsampwidth(2)  # 16-bit
-        wf.setframerate(RATE)
-        wf.writeframes(cleaned_data.astype(np.int16).tobytes())
-        wf.close()
-        
-        # Normalize
-        sound = AudioSegment.from_file(temp_np)
+        # Hand pydub an in-memory WAV
+        sound = AudioSegment.from_file(_write_wav(cleaned_data), format="wav")
         normalized = effects.normalize(sound)
         
-        clean_file = "temp_clean_audio.wav"
+        clean_file = io.BytesIO()
         normalized.export(clean_file, format="wav")
         
-        os.remove(temp_np)
         print("   ✅ Volume normalized")
     else:
         # Save without normalization
-        clean_file = "temp_clean_audio.wav"
-        wf = wave.open(clean_file, 'wb')
-        wf.setnchannels(CHANNELS)
-        wf.setsampwidth(2)
-        wf.setframerate(RATE)
-        wf.writeframes(cleaned_data.astype(np.int16).tobytes())
-        wf.close()
+        clean_file = _write_wav(cleaned_data)
     
     print("   ✅ Audio cleaned!\n")
     return clean_file
 
 
+# ============================================================================
+# SEGMENT TRANSCRIPTION
+# ============================================================================
+
+def stt_text(stt_result):
+    """Extract text from an STT result (dict or error string)"""
+    if isinstance(stt_result, dict):
+        return stt_result.get("text", "")
+    return str(stt_result)
+
+
+def transcribe_segment(pcm, snr_db):
+    """
+    Clean and transcribe one segment handed off by record_with_vad.
+    Runs on a worker thread while recording continues.
+    
+    Returns:
+        text: Transcribed text of the segment
+    """
+    raw_audio = io.BytesIO()
+    save_wav(raw_audio, pcm)
+    clean_audio_buffer = clean_audio(raw_audio, snr_db)
+    return stt_text(stt_online.transcribe_online(clean_audio_buffer))
+
+
 # ============================================================================
 # POST-PROCESSING
 # ============================================================================
 
+# Common STT mishearings of the wake word, matched in a single regex pass
+_CORRECTION_RE = re.compile(r"\b(?:service|jarvis|garbage|survice)\b", re.IGNORECASE)
+
+
 def correct_transcription(text):
     """
     Fix common STT mistakes with keyword correction.
     ChatGPT recommended this for "jarvis" → "service" issues.
     """
-    corrections = {
-        "service": "jarvis",
-        "jarvis": "jarvis",  # Ensure correct
-        "garbage": "jarvis",
-        "survice": "jarvis",
-    }
-    
-    text_lower = text.lower()
-    for wrong, right in corrections.items():
-        text_lower = text_lower.replace(wrong, right)
-    
-    return text_lower
+    return _CORRECTION_RE.sub("jarvis", text)
 
 
 # ============================================================================
@@ -320,6 +521,7 @@ def main():
     print("   • Press Ctrl+C to exit\n")
     
     conversation_count = 0
+    stt_executor = ThreadPoolExecutor(max_workers=1)
     
     try:
         while True:
@@ -328,29 +530,32 @@ def main():
             print(f"💬 CONVERSATION #{conversation_count}")
             print("─" * 70)
             
-            # 1. RECORD with WebRTC VAD
-            raw_audio_file = record_with_vad()
-            if not raw_audio_file:
+            # 1. RECORD with WebRTC VAD (earlier segments transcribe meanwhile)
+            segment_futures = []
+            
+            def submit_segment(pcm, snr_db):
+                segment_futures.append(
+                    stt_executor.submit(transcribe_segment, pcm, snr_db)
+                )
+            
+            raw_audio, snr_db = record_with_vad(on_segment=submit_segment)
+            if raw_audio is None:
                 continue
             
-            # 2. CLEAN audio (denoise + normalize)
-            clean_audio_file = clean_audio(raw_audio_file)
+            # 2. CLEAN audio (denoise + normalize, all in memory) while the
+            #    Groq connection is opened in the background
+            stt_executor.submit(stt_online.prewarm)
+            clean_audio_buffer = clean_audio(raw_audio, snr_db)
             
             # 3. STT
             print("🎧 Transcribing...")
             start_time = time.time()
-            stt_result = stt_online.transcribe_online(clean_audio_file)
+            stt_result = stt_online.transcribe_online(clean_audio_buffer)
+            segment_texts = [future.result() for future in segment_futures]
             stt_time = time.time() - start_time
             
-            # Cleanup temp files
-            os.remove(raw_audio_file)
-            os.remove(clean_audio_file)
-            
-            # Handle STT result (dict or error string)
-            if isinstance(stt_result, dict):
-                text = stt_result.get("text", "")
-            else:
-                text = str(stt_result)
+            # Join segment transcripts with the final one
+            text = " ".join(segment_texts + [stt_text(stt_result)]).strip()
             
             if not text or text.strip() == "":
                 print("❌ No speech detected. Try speaking louder!\n")
@@ -391,6 +596,7 @@ def main():
             print("\n✅ Complete!\n")
     
     except KeyboardInterrupt:
+        stt_executor.shutdown(wait=False)
         print("\n\n" + "="*70)
         print("👋 GOODBYE!")
         print("="*70)
@@ -68,13 +68,18 @@ try:
         frames_per_buffer=CHUNK
     )
     
-    frames = []
     total_chunks = int(RATE / CHUNK * RECORD_SECONDS)
+    chunk_bytes = CHUNK * audio.get_sample_size(FORMAT)
+    
+    # One buffer for the whole recording instead of a bytes object per chunk
+    buf = bytearray(total_chunks * chunk_bytes)
+    pos = 0
     
     # Record
     for i in range(total_chunks):
-        data = stream.read(CHUNK)
-        frames.append(data)
+        data = stream.read(CHUNK, exception_on_overflow=False)
+        buf[pos:pos + len(data)] = data
+        pos += len(data)
         
         # Progress bar
         if i % 5 == 0:
@@ -94,7 +99,7 @@ try:
     wf.setnchannels(CHANNELS)
     wf.setsampwidth(audio.get_sample_size(FORMAT))
     wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
+    wf.writeframes(memoryview(buf)[:pos])
     wf.close()
     print(f"✅ Saved!")
     
@@ -5,29 +5,41 @@ Tests all integrated skills through the brain interface.
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from backend.core import brain
 
-def test_skill(command: str, expected_intent: str = None):
-    """Test a single command and print results"""
+def print_result(command: str, result: dict, expected_intent: str = None):
+    """Print the result of a single command"""
     print(f"\n{'='*60}")
     print(f"🧪 Testing: {command}")
     print(f"{'='*60}")
     
-    result = brain.process_command(command)
-    
     print(f"✓ Response: {result['response']}")
     print(f"✓ Intent: {result['intent']}")
     print(f"✓ Success: {result['success']}")
     
     if expected_intent and result['intent'] != expected_intent:
         print(f"⚠️  WARNING: Expected intent '{expected_intent}', got '{result['intent']}'")
-    
+
+def test_skill(command: str, expected_intent: str = None):
+    """Test a single command and print results"""
+    result = brain.process_command(command)
+    print_result(command, result, expected_intent)
     return result
 
+def submit_skill(executor, command: str, expected_intent: str = None):
+    """Start a stateless command on the pool; printed later by report_skills"""
+    return command, expected_intent, executor.submit(brain.process_command, command)
+
+def report_skills(pending: list):
+    """Print results of submitted commands in submission order"""
+    for command, expected_intent, future in pending:
+        print_result(command, future.result(), expected_intent)
+
 def main():
     """Run all skill tests"""
     
@@ -35,24 +47,36 @@ def main():
     print("🚀 COMPREHENSIVE SKILLS TEST")
     print("="*60)
     
-    # Time & Date
-    print("\n📅 TIME & DATE SKILLS")
-    test_skill("what time is it", "time")
-    test_skill("what is today's date", "date")
-    
-    # System Info
-    print("\n💻 SYSTEM INFO SKILLS")
-    test_skill("battery status", "battery")
-    test_skill("cpu usage", "cpu")
-    test_skill("memory usage", "memory")
-    test_skill("system info")
-    
-    # Open App (will try to open - may fail if path incorrect)
-    print("\n🖥️  OPEN APP SKILL")
-    test_skill("open calculator", "open_app")
-    test_skill("open notepad", "open_app")
+    # Skills without shared state run concurrently; output stays in order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        time_date = [
+            submit_skill(executor, "what time is it", "time"),
+            submit_skill(executor, "what is today's date", "date"),
+        ]
+        system_info = [
+            submit_skill(executor, "battery status", "battery"),
+            submit_skill(executor, "cpu usage", "cpu"),
+            submit_skill(executor, "memory usage", "memory"),
+            submit_skill(executor, "system info"),
+        ]
+        # Open App (will try to open - may fail if path incorrect)
+        open_app = [
+            submit_skill(executor, "open calculator", "open_app"),
+            submit_skill(executor, "open notepad", "open_app"),
+        ]
+        
+        # Time & Date
+        print("\n📅 TIME & DATE SKILLS")
+        report_skills(time_date)
+        
+        # System Info
+        print("\n💻 SYSTEM INFO SKILLS")
+        report_skills(system_info)
+        
+        print("\n🖥️  OPEN APP SKILL")
+        report_skills(open_app)
     
-    # Alarms
+    # Alarms (write scheduler/DB state - kept serial)
     print("\n⏰ ALARM SKILL")
     test_skill("set alarm in 5 minutes", "alarm")
     test_skill("remind me in 10 minutes to check the oven", "alarm")
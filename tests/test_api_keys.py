@@ -3,96 +3,100 @@ Quick API Test Script
 Tests OpenRouter and Groq API keys
 """
 
-import requests
+import asyncio
+import httpx
 import os
 
 
-# Test OpenRouter (Qwen)
-print("🔍 Testing OpenRouter API...")
-openrouter_key = os.getenv("OPENROUTER_API_KEY")
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+GROQ_MODELS_URL = "https://api.groq.com/openai/v1/models"
 
-if not openrouter_key or openrouter_key.startswith("sk-or-v1-"):
-    print("❌ OpenRouter: API key not set or using placeholder. Please set OPENROUTER_API_KEY in your environment.")
-else:
+
+def _auth_headers(key: str) -> dict:
+    return {
+        "Authorization": f"Bearer {key}",
+        "Content-Type": "application/json"
+    }
+
+
+def _openrouter_ok(result: dict) -> list:
+    message = result["choices"][0]["message"]["content"]
+    return [
+        f"✅ OpenRouter: SUCCESS",
+        f"   Response: {message}",
+    ]
+
+
+def _groq_ok(models: dict) -> list:
+    return [
+        f"✅ Groq: SUCCESS - API key is valid",
+        f"   Available models: {len(models.get('data', []))} models",
+    ]
+
+
+async def probe(client: httpx.AsyncClient, name: str, method: str, url: str, on_success, **kwargs) -> list:
+    """
+    Send one API request and return the status lines to print.
+
+    Args:
+        name: API name used in the status lines
+        method: HTTP method ("GET" or "POST")
+        on_success: Builds the success lines from the JSON body of a 200 response
+        **kwargs: Passed to client.request (headers, json, ...)
+    """
     try:
-        response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {openrouter_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "qwen/qwen-2.5-7b-instruct",
-                "messages": [{"role": "user", "content": "Say 'API key working!'"}]
-            },
-            timeout=10
-        )
+        response = await client.request(method, url, **kwargs)
+
         if response.status_code == 200:
-            result = response.json()
-            message = result["choices"][0]["message"]["content"]
-            print(f"✅ OpenRouter: SUCCESS")
-            print(f"   Response: {message}")
-        else:
-            print(f"❌ OpenRouter: FAILED")
-            print(f"   Status: {response.status_code}")
-            print(f"   Error: {response.text}")
+            return on_success(response.json())
+        return [
+            f"❌ {name}: FAILED",
+            f"   Status: {response.status_code}",
+            f"   Error: {response.text}",
+        ]
+
     except Exception as e:
-        print(f"❌ OpenRouter: ERROR - {e}")
-print()
-
-try:
-    response = requests.post(
-        "https://openrouter.ai/api/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {openrouter_key}",
-            "Content-Type": "application/json"
-        },
-        json={
-            "model": "qwen/qwen-2.5-7b-instruct",
-            "messages": [{"role": "user", "content": "Say 'API key working!'"}]
-        },
-        timeout=10
-    )
-    
-    if response.status_code == 200:
-        result = response.json()
-        message = result["choices"][0]["message"]["content"]
-        print(f"✅ OpenRouter: SUCCESS")
-        print(f"   Response: {message}")
-    else:
-        print(f"❌ OpenRouter: FAILED")
-        print(f"   Status: {response.status_code}")
-        print(f"   Error: {response.text}")
-
-except Exception as e:
-    print(f"❌ OpenRouter: ERROR - {e}")
-
-print()
-
-# Test Groq
-print("🔍 Testing Groq API...")
-groq_key = os.getenv("GROQ_API_KEY", "")  # Load from environment variable or leave empty
-
-try:
-    response = requests.get(
-        "https://api.groq.com/openai/v1/models",
-        headers={
-            "Authorization": f"Bearer {groq_key}",
-            "Content-Type": "application/json"
-        },
-        timeout=10
-    )
-    
-    if response.status_code == 200:
-        models = response.json()
-        print(f"✅ Groq: SUCCESS - API key is valid")
-        print(f"   Available models: {len(models.get('data', []))} models")
-    else:
-        print(f"❌ Groq: FAILED")
-        print(f"   Status: {response.status_code}")
-        print(f"   Error: {response.text}")
-
-except Exception as e:
-    print(f"❌ Groq: ERROR - {e}")
-
-print("\n✅ API test complete!")
+        return [f"❌ {name}: ERROR - {e}"]
+
+
+async def main():
+    """Run all probes concurrently, then print results in order"""
+    openrouter_key = os.getenv("OPENROUTER_API_KEY")
+    groq_key = os.getenv("GROQ_API_KEY", "")  # Load from environment variable or leave empty
+
+    print("🔍 Testing OpenRouter and Groq APIs...\n")
+
+    async with httpx.AsyncClient(timeout=10, limits=httpx.Limits(max_connections=8)) as client:
+        probes = []
+
+        # Test OpenRouter (Qwen)
+        if not openrouter_key or openrouter_key.startswith("sk-or-v1-"):
+            print("❌ OpenRouter: API key not set or using placeholder. Please set OPENROUTER_API_KEY in your environment.\n")
+        else:
+            probes.append(probe(
+                client, "OpenRouter", "POST", OPENROUTER_URL, _openrouter_ok,
+                headers=_auth_headers(openrouter_key),
+                json={
+                    "model": "qwen/qwen-2.5-7b-instruct",
+                    "messages": [{"role": "user", "content": "Say 'API key working!'"}]
+                }
+            ))
+
+        # Test Groq
+        probes.append(probe(
+            client, "Groq", "GET", GROQ_MODELS_URL, _groq_ok,
+            headers=_auth_headers(groq_key)
+        ))
+
+        results = await asyncio.gather(*probes)
+
+    for lines in results:
+        for line in lines:
+            print(line)
+        print()
+
+    print("✅ API test complete!")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
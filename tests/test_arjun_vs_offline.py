@@ -6,10 +6,17 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 from colorama import init, Fore, Style
-init(autoreset=True)
+init(autoreset=False)  # Colors are reset explicitly; skips the per-write reset
+
+# Precomputed color codes
+CYAN = Fore.CYAN
+GREEN = Fore.GREEN
+RED = Fore.RED
+YELLOW = Fore.YELLOW
+RESET = Style.RESET_ALL
 
 from core import tts_manager
-import subprocess
+from core.audio_io import play_file
 
 print("\n" + "="*70)
 print("  ARJUN VOICE COMPARISON: Online vs Offline")
@@ -20,34 +27,34 @@ test_text = "Good morning, sir. All systems are operational. How may I assist yo
 print(f"Test sentence: '{test_text}'\n")
 
 # Test 1: Online (Arjun - your 5/5 rated voice)
-print(f"{Fore.CYAN}1. ONLINE MODE (Arjun +11% +7Hz - Your 5/5 rated voice):{Style.RESET_ALL}")
+print(f"{CYAN}1. ONLINE MODE (Arjun +11% +7Hz - Your 5/5 rated voice):{RESET}")
 print("   Generating...")
 audio_online, engine_online = tts_manager.speak(test_text, prefer_offline=False)
 if audio_online:
     print(f"   ✓ Generated with: {engine_online}")
     print(f"   Playing online voice...")
-    subprocess.run(['start', audio_online], shell=True)
-    input(f"\n   {Fore.GREEN}Press Enter after listening...{Style.RESET_ALL}")
+    play_file(audio_online)
+    input(f"\n   {GREEN}Press Enter after listening...{RESET}")
 else:
-    print(f"   {Fore.RED}✗ Failed{Style.RESET_ALL}")
+    print(f"   {RED}✗ Failed{RESET}")
 
 print()
 
 # Test 2: Offline (David tuned to match Arjun speed)
-print(f"{Fore.CYAN}2. OFFLINE MODE (Microsoft David at 175 WPM - tuned to match Arjun):{Style.RESET_ALL}")
+print(f"{CYAN}2. OFFLINE MODE (Microsoft David at 175 WPM - tuned to match Arjun):{RESET}")
 print("   Generating...")
 audio_offline, engine_offline = tts_manager.speak(test_text, prefer_offline=True)
 if audio_offline:
     print(f"   ✓ Generated with: {engine_offline}")
     print(f"   Playing offline voice...")
-    subprocess.run(['start', audio_offline], shell=True)
-    input(f"\n   {Fore.GREEN}Press Enter after listening...{Style.RESET_ALL}")
+    play_file(audio_offline)
+    input(f"\n   {GREEN}Press Enter after listening...{RESET}")
 else:
-    print(f"   {Fore.RED}✗ Failed{Style.RESET_ALL}")
+    print(f"   {RED}✗ Failed{RESET}")
 
 print()
 print("="*70)
-print(f"{Fore.YELLOW}COMPARISON NOTES:{Style.RESET_ALL}")
+print(f"{YELLOW}COMPARISON NOTES:{RESET}")
 print()
 print("Online (Arjun):")
 print("  ✓ Natural neural voice")
@@ -65,7 +72,7 @@ print("  ✗ System TTS limitations")
 print()
 print("="*70)
 print()
-print(f"{Fore.GREEN}RECOMMENDATION:{Style.RESET_ALL}")
+print(f"{GREEN}RECOMMENDATION:{RESET}")
 print("• Use ONLINE (Arjun) when internet available - much better quality")
 print("• Use OFFLINE (David) only as emergency fallback")
 print("• System auto-selects best available")
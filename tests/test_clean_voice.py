@@ -8,7 +8,7 @@ import sys
 import wave
 import pyaudio
 import time
-import struct
+import numpy as np
 from dotenv import load_dotenv
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,22 +16,62 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Load environment
 load_dotenv('backend/.env')
 
-from backend.core import stt_online, brain, tts_manager, tts_online
+from backend.core import audio_io, stt_online, brain, tts_manager, tts_online
+from backend.core.audio_io import vad_step
 
 print("\n" + "="*70)
 print("🎤 JARVIS VOICE ASSISTANT - CLEAN TEST")
 print("="*70)
 
 # Audio config
-CHUNK = 1024
+CHUNK = 256  # 16ms chunks - fast end-of-speech detection
 FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 16000
+MAX_RECORD_SECONDS = 30  # Capture buffer size (recording stops when full)
+VOICE_FILE = "temp_voice.wav"  # Overwritten each turn, removed on exit
+
+# Energy VAD settings
+SILENCE_THRESHOLD = 150
+SPEECH_THRESHOLD = 230
+MAX_SILENCE_CHUNKS = int(1.5 * RATE / CHUNK)  # 1.5s of silence stops recording
+
+# Level meter
+UI_EVERY_CHUNKS = 4  # Redraw every 4 chunks (~15 Hz)
+BAR_CHARS = "█" * 40
+
+
+# Compile the energy VAD step now rather than on the first recording
+audio_io.warm_up_vad_step(CHUNK)
+
+FOLLOWUP_CLOSING = "Let me know if you need anything else!"
 
 audio = pyaudio.PyAudio()
 
-def record_command():
-    """Record with visual feedback and auto-stop"""
+# Open the input device once; each recording just starts/stops the stream
+input_stream = audio.open(
+    format=FORMAT,
+    channels=CHANNELS,
+    rate=RATE,
+    input=True,
+    frames_per_buffer=CHUNK,
+    start=False
+)
+
+# Audio files for fixed phrases, synthesized once (deleted on exit)
+_speech_cache = {}
+
+def speak_cached(text):
+    """Synthesize a fixed phrase once and reuse its audio file"""
+    audio_path = _speech_cache.get(text)
+    if not audio_path or not os.path.exists(audio_path):
+        audio_path, _ = tts_manager.speak(text)
+        if audio_path:
+            _speech_cache[text] = audio_path
+    return audio_path
+
+def record_command(stream):
+    """Record from an opened (stopped) input stream with visual feedback and auto-stop"""
     print("\n🔴 Press ENTER to start recording...")
     input()
     
@@ -42,65 +82,54 @@ def record_command():
     import winsound
     winsound.Beep(1000, 100)
     
-    stream = audio.open(
-        format=FORMAT,
-        channels=CHANNELS,
-        rate=RATE,
-        input=True,
-        frames_per_buffer=CHUNK
-    )
+    stream.start_stream()
     
-    frames = []
-    silence_threshold = 150
-    speech_threshold = 230
+    # Pre-allocated capture buffer, filled at a moving offset
+    buffer = bytearray(RATE * 2 * MAX_RECORD_SECONDS)
+    offset = 0
     silence_chunks = 0
-    max_silence = 24
-    recording = False
     started = False
+    chunks_since_ui = 0
     
     while True:
         data = stream.read(CHUNK, exception_on_overflow=False)
         
-        # Calculate energy
-        samples = struct.unpack(f"{len(data)//2}h", data)
-        energy = int((sum(s**2 for s in samples) / len(samples))**0.5)
-        
-        # Visual feedback
-        bar = "█" * min(40, energy // 6)
-        status = "🎤 RECORDING" if energy > speech_threshold else "⏸️  waiting"
-        print(f"\r   {status} | {energy:4d} | {bar:40} ", end="", flush=True)
+        # Energy + start/stop decision (compiled when numba is available)
+        energy, started, silence_chunks, done = vad_step(
+            np.frombuffer(data, dtype=np.int16), started, silence_chunks,
+            SILENCE_THRESHOLD, SPEECH_THRESHOLD, MAX_SILENCE_CHUNKS
+        )
         
-        # Start on speech
-        if not started and energy > speech_threshold:
-            started = True
-            recording = True
-            frames = [data]
-            silence_chunks = 0
-            continue
+        # Visual feedback (throttled - one console write per UI_EVERY_CHUNKS)
+        chunks_since_ui += 1
+        if chunks_since_ui >= UI_EVERY_CHUNKS:
+            chunks_since_ui = 0
+            bar = BAR_CHARS[:min(40, energy // 6)]
+            status = "🎤 RECORDING" if energy > SPEECH_THRESHOLD else "⏸️  waiting"
+            sys.stdout.write(f"\r   {status} | {energy:4d} | {bar:40} ")
+            sys.stdout.flush()
         
-        # Continue recording
-        if recording:
-            frames.append(data)
+        # Record from the first speech chunk on
+        if started:
+            if offset + len(data) > len(buffer):
+                break  # Buffer full
+            buffer[offset:offset + len(data)] = data
+            offset += len(data)
             
-            if energy < silence_threshold:
-                silence_chunks += 1
-                if silence_chunks >= max_silence:
-                    break
-            else:
-                silence_chunks = 0
+            if done:
+                break
     
     stream.stop_stream()
-    stream.close()
     winsound.Beep(800, 100)
     print("\n")
     
-    # Save
-    filename = "temp_voice.wav"
+    # Save ('wb' truncates, so the same file is reused every turn)
+    filename = VOICE_FILE
     wf = wave.open(filename, 'wb')
     wf.setnchannels(CHANNELS)
     wf.setsampwidth(audio.get_sample_size(FORMAT))
     wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
+    wf.writeframes(memoryview(buffer)[:offset])
     wf.close()
     
     return filename
@@ -114,7 +143,7 @@ print("✅ Online - using Groq STT + Edge TTS\n")
 try:
     while True:
         # Record
-        audio_file = record_command()
+        audio_file = record_command(input_stream)
         
         # STT
         print("🎧 Transcribing...")
@@ -124,7 +153,6 @@ try:
         
         if not text or text.strip() == "":
             print("❌ No speech detected\n")
-            os.remove(audio_file)
             continue
         
         print(f"   📝 You: {text}")
@@ -189,19 +217,18 @@ try:
                 # Loop continues to record next input
             else:
                 print("⏱️  Timeout - closing conversation")
-                print("💬 Jarvis: Let me know if you need anything else!")
-                audio_path, _ = tts_manager.speak("Let me know if you need anything else!")
+                print(f"💬 Jarvis: {FOLLOWUP_CLOSING}")
+                audio_path = speak_cached(FOLLOWUP_CLOSING)
                 if audio_path:
                     tts_online.play_audio(audio_path)
-                    try:
-                        os.remove(audio_path)
-                    except:
-                        pass
                 print()
-        
-        # Cleanup
-        os.remove(audio_file)
 
 except KeyboardInterrupt:
     print("\n\n✅ Goodbye!")
+    input_stream.close()
     audio.terminate()
+    for cached_path in [VOICE_FILE, *_speech_cache.values()]:
+        try:
+            os.remove(cached_path)
+        except:
+            pass
@@ -8,8 +8,11 @@ Step 4: TTS (Text to Speech) with Arjun
 
 import os
 import sys
+import time
 import wave
+import winsound
 import pyaudio
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Add backend to path
@@ -20,6 +23,14 @@ load_dotenv('backend/.env')
 
 from backend.core import stt_online, brain, tts_manager
 
+# Open the audio output device once (not per response)
+try:
+    from pygame import mixer
+    mixer.init()
+except Exception as e:
+    print(f"⚠️  pygame mixer unavailable ({e}) - MP3 playback disabled")
+    mixer = None
+
 print("=" * 70)
 print("🎤 JARVIS COMPLETE VOICE TEST")
 print("=" * 70)
@@ -42,14 +53,14 @@ FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 16000
 RECORD_SECONDS = 5
-OUTPUT_FILE = "voice_input.wav"
+OUTPUT_FILE = "voice_input.wav"  # Reused across runs ('wb' truncates)
 
 audio = pyaudio.PyAudio()
+pool = ThreadPoolExecutor(max_workers=1)
 
 input("\n   Press ENTER when ready to speak...")
 
 print("\n   3...")
-import time
 time.sleep(1)
 print("   2...")
 time.sleep(1)
@@ -59,6 +70,9 @@ print(f"\n🔴 SPEAK NOW! ({RECORD_SECONDS} seconds)")
 print("   Try: 'What is the weather in New York?'\n")
 
 try:
+    # Open the Groq connection while recording so STT starts on a warm socket
+    pool.submit(stt_online.prewarm)
+    
     stream = audio.open(
         format=FORMAT,
         channels=CHANNELS,
@@ -67,12 +81,16 @@ try:
         frames_per_buffer=CHUNK
     )
     
-    frames = []
     total = int(RATE / CHUNK * RECORD_SECONDS)
     
+    # Pre-allocated capture buffer, filled at a moving offset
+    buffer = bytearray(total * CHUNK * 2)
+    offset = 0
+    
     for i in range(total):
         data = stream.read(CHUNK)
-        frames.append(data)
+        buffer[offset:offset + len(data)] = data
+        offset += len(data)
         if i % 10 == 0:
             percent = int((i / total) * 100)
             print(f"   Recording... {percent}%", end='\r')
@@ -87,7 +105,7 @@ try:
     wf.setnchannels(CHANNELS)
     wf.setsampwidth(audio.get_sample_size(FORMAT))
     wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
+    wf.writeframes(memoryview(buffer)[:offset])
     wf.close()
     
     # Test 3: Transcribe (STT)
@@ -123,22 +141,17 @@ try:
         print(f"\n✅ Audio generated: {audio_path}")
         print(f"   Engine: {engine}")
         
-        # Play audio (Windows)
-        import winsound
-        if audio_path.endswith('.mp3'):
+        # Play audio (Windows) and wait for it to finish
+        if audio_path.endswith('.mp3') and mixer is not None:
             print("\n   Playing audio...")
-            from pygame import mixer
-            mixer.init()
             mixer.music.load(audio_path)
             mixer.music.play()
             while mixer.music.get_busy():
-                time.sleep(0.1)
+                time.sleep(0.02)
         elif audio_path.endswith('.wav'):
             winsound.PlaySound(audio_path, winsound.SND_FILENAME)
-    
-    # Clean up
-    if os.path.exists(OUTPUT_FILE):
-        os.remove(OUTPUT_FILE)
+        else:
+            print(f"\n   ⚠️  Playback skipped (no player for {os.path.basename(audio_path)})")
     
     print("\n" + "=" * 70)
     print("✅ COMPLETE VOICE TEST SUCCESSFUL!")
@@ -156,4 +169,5 @@ except Exception as e:
     traceback.print_exc()
 
 finally:
+    pool.shutdown(wait=False)
     audio.terminate()
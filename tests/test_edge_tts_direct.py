@@ -1,12 +1,20 @@
 import edge_tts
 import asyncio
+from io import BytesIO
 
 async def test():
     text = "Hello, I am Jarvis. Testing Edge TTS."
     voice = "hi-IN-ArjunNeural"
     
     communicate = edge_tts.Communicate(text, voice)
-    await communicate.save("test_edge.mp3")
-    print("✅ Edge TTS works! File saved: test_edge.mp3")
+    
+    # Collect the audio in memory - nothing is written to disk
+    buf = BytesIO()
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            buf.write(chunk["data"])
+    
+    assert buf.tell() > 0, "Edge TTS returned no audio"
+    print(f"✅ Edge TTS works! Received {buf.tell()} bytes of audio")
 
 asyncio.run(test())
@@ -3,28 +3,78 @@ Test Script for Jarvis API Endpoints
 Tests each endpoint step-by-step with clear output.
 """
 
-import requests
+import httpx
 import json
+import time
 from colorama import init, Fore, Style
 
 # Initialize colorama for colored output
-init(autoreset=True)
+init(autoreset=False)  # Colors are reset explicitly; skips the per-write reset
+
+# Precomputed color codes
+CYAN = Fore.CYAN
+GREEN = Fore.GREEN
+MAGENTA = Fore.MAGENTA
+RED = Fore.RED
+YELLOW = Fore.YELLOW
+RESET = Style.RESET_ALL
 
 BASE_URL = "http://127.0.0.1:5000"
 
+# Retry transient gateway errors with backoff
+RETRIES = 2
+BACKOFF_FACTOR = 0.2
+RETRY_STATUSES = {502, 503, 504}
+
+
+class RetryTransport(httpx.HTTPTransport):
+    """HTTP transport that retries connection errors and 502/503/504 responses"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(retries=RETRIES, **kwargs)
+    
+    def handle_request(self, request):
+        for attempt in range(RETRIES + 1):
+            response = super().handle_request(request)
+            if response.status_code not in RETRY_STATUSES or attempt == RETRIES:
+                return response
+            response.close()
+            time.sleep(BACKOFF_FACTOR * (2 ** attempt))
+
+
+def create_client():
+    """Keep-alive client for all endpoint tests (HTTP/2 when h2 is installed)"""
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    
+    limits = httpx.Limits(max_keepalive_connections=8)
+    return httpx.Client(
+        base_url=BASE_URL,
+        timeout=30.0,  # Offline TTS can be slow
+        http2=http2,
+        transport=RetryTransport(http2=http2, limits=limits),
+    )
+
+
+# Shared by main and by the test functions' defaults (so pytest can call them directly)
+CLIENT = create_client()
+
 def print_header(step, title):
     """Print a formatted header"""
     print("\n" + "="*70)
-    print(f"{Fore.CYAN}STEP {step}: {title}{Style.RESET_ALL}")
+    print(f"{CYAN}STEP {step}: {title}{RESET}")
     print("="*70)
 
 def print_success(message):
     """Print success message"""
-    print(f"{Fore.GREEN}✓ {message}{Style.RESET_ALL}")
+    print(f"{GREEN}✓ {message}{RESET}")
 
 def print_error(message):
     """Print error message"""
-    print(f"{Fore.RED}✗ {message}{Style.RESET_ALL}")
+    print(f"{RED}✗ {message}{RESET}")
 
 def print_json(data):
     """Print formatted JSON"""
@@ -34,10 +84,10 @@ def print_json(data):
 # ============================================================================
 # STEP 1: Root Endpoint
 # ============================================================================
-def test_root():
+def test_root(client=CLIENT):
     print_header(1, "Test Root Endpoint (GET /)")
     try:
-        response = requests.get(f"{BASE_URL}/")
+        response = client.get("/")
         if response.status_code == 200:
             print_success(f"Status Code: {response.status_code}")
             print_json(response.json())
@@ -53,10 +103,10 @@ def test_root():
 # ============================================================================
 # STEP 2: Health Check
 # ============================================================================
-def test_health():
+def test_health(client=CLIENT):
     print_header(2, "Test Health Check (GET /health)")
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = client.get("/health")
         if response.status_code == 200:
             print_success(f"Status Code: {response.status_code}")
             data = response.json()
@@ -86,18 +136,18 @@ def test_health():
 # ============================================================================
 # STEP 3: Text-to-Speech
 # ============================================================================
-def test_speak():
+def test_speak(client=CLIENT):
     print_header(3, "Test Text-to-Speech (POST /speak)")
     
     # Test online TTS (gTTS)
-    print(f"\n{Fore.YELLOW}Testing ONLINE TTS (gTTS)...{Style.RESET_ALL}")
+    print(f"\n{YELLOW}Testing ONLINE TTS (gTTS)...{RESET}")
     try:
         payload = {
             "text": "Hello! I am Jarvis, your AI assistant.",
             "online": True,
             "lang": "en"
         }
-        response = requests.post(f"{BASE_URL}/speak", json=payload)
+        response = client.post("/speak", json=payload)
         if response.status_code == 200:
             print_success(f"Status Code: {response.status_code}")
             data = response.json()
@@ -110,14 +160,14 @@ def test_speak():
         print_error(f"Online TTS failed: {e}")
     
     # Test offline TTS (Coqui)
-    print(f"\n{Fore.YELLOW}Testing OFFLINE TTS (Coqui)...{Style.RESET_ALL}")
+    print(f"\n{YELLOW}Testing OFFLINE TTS (Coqui)...{RESET}")
     try:
         payload = {
             "text": "This is offline text to speech using Coqui TTS.",
             "online": False,
             "lang": "en"
         }
-        response = requests.post(f"{BASE_URL}/speak", json=payload)
+        response = client.post("/speak", json=payload)
         if response.status_code == 200:
             print_success(f"Status Code: {response.status_code}")
             data = response.json()
@@ -133,19 +183,19 @@ def test_speak():
 # ============================================================================
 # STEP 4: Conversation History
 # ============================================================================
-def test_history():
+def test_history(client=CLIENT):
     print_header(4, "Test Conversation History (GET /history)")
     try:
-        response = requests.get(f"{BASE_URL}/history?limit=5")
+        response = client.get("/history", params={"limit": 5})
         if response.status_code == 200:
             print_success(f"Status Code: {response.status_code}")
             data = response.json()
-            print(f"\n{Fore.YELLOW}Total conversations: {data.get('total')}{Style.RESET_ALL}")
+            print(f"\n{YELLOW}Total conversations: {data.get('total')}{RESET}")
             
             if data.get('history'):
-                print(f"\n{Fore.YELLOW}Recent conversations:{Style.RESET_ALL}")
+                print(f"\n{YELLOW}Recent conversations:{RESET}")
                 for i, conv in enumerate(data.get('history', [])[:3], 1):
-                    print(f"\n{Fore.CYAN}Conversation {i}:{Style.RESET_ALL}")
+                    print(f"\n{CYAN}Conversation {i}:{RESET}")
                     print(f"  User: {conv.get('user_text', 'N/A')}")
                     print(f"  Assistant: {conv.get('assistant_text', 'N/A')}")
                     print(f"  Intent: {conv.get('intent', 'N/A')}")
@@ -165,34 +215,35 @@ def test_history():
 # MAIN TEST RUNNER
 # ============================================================================
 def main():
-    print(f"\n{Fore.MAGENTA}{'='*70}")
+    print(f"\n{MAGENTA}{'='*70}")
     print(f"  JARVIS API ENDPOINT TESTING")
     print(f"  Testing backend: {BASE_URL}")
-    print(f"{'='*70}{Style.RESET_ALL}\n")
-    
-    # Check if server is running
-    print(f"{Fore.YELLOW}Checking if server is running...{Style.RESET_ALL}")
-    try:
-        requests.get(BASE_URL, timeout=2)
-        print_success("Server is running!")
-    except:
-        print_error("Server is NOT running!")
-        print(f"\n{Fore.YELLOW}Please start the server first:{Style.RESET_ALL}")
-        print("  cd backend")
-        print("  python app.py")
-        return
+    print(f"{'='*70}{RESET}\n")
     
-    # Run tests
-    test_root()
-    test_health()
-    test_speak()
-    test_history()
+    with CLIENT as client:
+        # Check if server is running
+        print(f"{YELLOW}Checking if server is running...{RESET}")
+        try:
+            client.get("/", timeout=2)
+            print_success("Server is running!")
+        except:
+            print_error("Server is NOT running!")
+            print(f"\n{YELLOW}Please start the server first:{RESET}")
+            print("  cd backend")
+            print("  python app.py")
+            return
+        
+        # Run tests
+        test_root(client)
+        test_health(client)
+        test_speak(client)
+        test_history(client)
     
-    print(f"\n{Fore.MAGENTA}{'='*70}")
+    print(f"\n{MAGENTA}{'='*70}")
     print(f"  TESTING COMPLETE!")
-    print(f"{'='*70}{Style.RESET_ALL}\n")
+    print(f"{'='*70}{RESET}\n")
     
-    print(f"{Fore.YELLOW}Next Steps:{Style.RESET_ALL}")
+    print(f"{YELLOW}Next Steps:{RESET}")
     print("  1. Test PDF summarization with an actual PDF file")
     print("  2. Test Speech-to-Text with an audio file")
     print("  3. Build the Electron frontend!")
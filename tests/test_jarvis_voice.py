@@ -8,24 +8,32 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 from colorama import init, Fore, Style
-init(autoreset=True)
+init(autoreset=False)  # Colors are reset explicitly; skips the per-write reset
+
+# Precomputed color codes
+CYAN = Fore.CYAN
+GREEN = Fore.GREEN
+RED = Fore.RED
+YELLOW = Fore.YELLOW
+RESET = Style.RESET_ALL
 
 from core import tts_online
-import subprocess
+from core.audio_io import play_file
+from concurrent.futures import ThreadPoolExecutor
 
 def test_tts():
     """Test the TTS system"""
     
-    print(f"\n{Fore.CYAN}{'='*70}")
+    print(f"\n{CYAN}{'='*70}")
     print(f"  JARVIS TTS SYSTEM TEST")
-    print(f"{'='*70}{Style.RESET_ALL}\n")
+    print(f"{'='*70}{RESET}\n")
     
     # Show current configuration
-    print(f"{Fore.GREEN}Current TTS Engine:{Style.RESET_ALL}")
+    print(f"{GREEN}Current TTS Engine:{RESET}")
     print(f"  {tts_online.get_current_engine()}\n")
     
     voice_info = tts_online.get_voice_info()
-    print(f"{Fore.GREEN}Voice Configuration:{Style.RESET_ALL}")
+    print(f"{GREEN}Voice Configuration:{RESET}")
     for key, value in voice_info.items():
         print(f"  {key}: {value}")
     print()
@@ -41,33 +49,41 @@ def test_tts():
         ("Question", "Would you like me to proceed with the next step?", "en")
     ]
     
-    for title, text, lang in test_cases:
-        print(f"\n{Fore.YELLOW}Testing: {title}{Style.RESET_ALL}")
+    # Synthesize all clips in the background; later ones are ready by the
+    # time the earlier ones have been listened to
+    executor = ThreadPoolExecutor(max_workers=len(test_cases))
+    clips = [executor.submit(tts_online.speak_online, text, lang=lang)
+             for _, text, lang in test_cases]
+    
+    for (title, text, lang), clip in zip(test_cases, clips):
+        print(f"\n{YELLOW}Testing: {title}{RESET}")
         print(f"  Text: '{text}'")
         print(f"  Language: {lang}")
         
-        # Generate speech
-        audio_path = tts_online.speak_online(text, lang=lang)
+        # Wait for this clip's speech
+        audio_path = clip.result()
         
         if audio_path:
-            print(f"{Fore.GREEN}  ✓ Generated: {audio_path}{Style.RESET_ALL}")
+            print(f"{GREEN}  ✓ Generated: {audio_path}{RESET}")
             
             # Play audio
             print(f"  Playing audio...")
-            subprocess.run(['start', audio_path], shell=True)
+            play_file(audio_path)
             
-            rating = input(f"\n  {Fore.CYAN}Rate this (1-5 or Enter to continue): {Style.RESET_ALL}")
+            rating = input(f"\n  {CYAN}Rate this (1-5 or Enter to continue): {RESET}")
             if rating:
                 print(f"  You rated: {rating}/5")
         else:
-            print(f"{Fore.RED}  ✗ Failed to generate audio{Style.RESET_ALL}")
+            print(f"{RED}  ✗ Failed to generate audio{RESET}")
         
-        choice = input(f"\n  {Fore.CYAN}Continue to next test? (y/n): {Style.RESET_ALL}")
+        choice = input(f"\n  {CYAN}Continue to next test? (y/n): {RESET}")
         if choice.lower() != 'y':
             break
     
-    print(f"\n{Fore.GREEN}✨ TTS testing complete!{Style.RESET_ALL}\n")
-    print(f"{Fore.CYAN}Your Jarvis voice is ready to use!{Style.RESET_ALL}")
+    executor.shutdown(wait=False, cancel_futures=True)
+    
+    print(f"\n{GREEN}✨ TTS testing complete!{RESET}\n")
+    print(f"{CYAN}Your Jarvis voice is ready to use!{RESET}")
     print(f"\nNext steps:")
     print(f"  1. Test with backend API (/speak endpoint)")
     print(f"  2. Integrate with STT for full conversation")
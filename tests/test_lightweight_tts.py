@@ -3,11 +3,18 @@ Test lightweight TTS models for offline use
 Using VITS models (~50MB) instead of XTTS (~2GB)
 """
 
-from TTS.api import TTS
+import functools
+import multiprocessing as mp
 import os
+import queue
 
-print("🔧 Available lightweight TTS models:")
-print("=" * 60)
+# Persistent model cache - inherited by the TTS worker process
+os.environ.setdefault("TTS_HOME", os.path.expanduser("~/.cache/tts"))
+
+import pygame
+
+# Posted by pygame.mixer.music when a sample finishes playing
+MUSIC_END = pygame.USEREVENT + 1
 
 # Lightweight single-language models
 models_to_test = [
@@ -25,54 +32,156 @@ models_to_test = [
     }
 ]
 
-# For Hindi, we'll need to use pyttsx3 or look for alternatives
-print("\n⚠️  Note: Lightweight models are mostly English-only")
-print("For Hindi support offline, we'll use pyttsx3 or need XTTS-v2 (2GB)\n")
-
 # Test sentence
 test_text = "Hello! I am Jarvis, your AI assistant. How can I help you today?"
 
 output_dir = "c:/Users/Lunar Panda/3-Main/assistant/voice_tests/lightweight_samples"
-os.makedirs(output_dir, exist_ok=True)
 
-print("\n🎤 Testing lightweight models...")
-print("=" * 60)
 
-for model_info in models_to_test:
-    model_name = model_info["name"]
-    print(f"\n📦 Model: {model_name}")
-    print(f"   Size: {model_info['size']}")
-    print(f"   Description: {model_info['description']}")
-    print(f"   Downloading and testing...")
+# ============================================================================
+# TTS WORKER PROCESS
+# ============================================================================
+# torch/Coqui are imported and models loaded only inside one spawned worker
+# that lives for the whole run - the main process stays light, and a CUDA
+# OOM takes down the worker instead of the test.
+
+torch = None
+TTS = None
+USE_CUDA = False
+
+
+def tts_worker(jobs, results):
+    """Synthesize (model_name, file_path) jobs until None; reply (file_path, error)"""
+    global torch, TTS, USE_CUDA
+    import torch
+    from TTS.api import TTS
+    
+    # On GPU: TF32 matmuls plus fp16 autocast for synthesis (roughly half the
+    # VRAM and ~2x throughput); CPU stays on fp32
+    USE_CUDA = torch.cuda.is_available()
+    if USE_CUDA:
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
     
+    while (job := jobs.get()) is not None:
+        model_name, file_path = job
+        try:
+            synthesize(load_tts(model_name), test_text, file_path)
+            results.put((file_path, None))
+        except Exception as e:
+            results.put((None, str(e)))
+
+
+@functools.lru_cache(maxsize=4)
+def load_tts(model_name):
+    """Load a model once per process; repeat calls reuse the in-memory instance"""
+    tts = TTS(model_name=model_name)
+    if USE_CUDA:
+        tts.to("cuda")
+        compile_tts(tts)
+    return tts
+
+
+def compile_tts(tts):
+    """
+    torch.compile the model's inference pass (reduce-overhead = CUDA graphs)
+    and warm it up twice so compilation isn't billed to the first sample.
+    Falls back to eager if compilation is unsupported (e.g. no Triton).
+    """
+    model = tts.synthesizer.tts_model
+    eager = model.inference
+    model.inference = torch.compile(eager, mode="reduce-overhead")
     try:
-        tts = TTS(model_name=model_name)
-        
-        output_file = f"{output_dir}/{model_name.replace('/', '_')}.wav"
-        tts.tts_to_file(
-            text=test_text,
-            file_path=output_file
-        )
-        
+        for _ in range(2):
+            with torch.inference_mode(), torch.autocast("cuda", dtype=torch.float16):
+                tts.tts(text=test_text)
+    except Exception as e:
+        print(f"   ⚠️  torch.compile unavailable, using eager mode: {e}")
+        model.inference = eager
+
+
+def synthesize(tts, text, file_path):
+    """tts_to_file without autograd, under fp16 autocast when on CUDA"""
+    with torch.inference_mode(), torch.autocast("cuda", dtype=torch.float16, enabled=USE_CUDA):
+        tts.tts_to_file(text=text, file_path=file_path)
+
+
+def next_result(results, worker):
+    """Wait for the worker's next (file_path, error), failing fast if it died"""
+    while True:
+        try:
+            return results.get(timeout=1)
+        except queue.Empty:
+            if not worker.is_alive():
+                return None, f"TTS worker exited (code {worker.exitcode})"
+
+
+def main():
+    """Queue one sample per model on the worker, then play and rate each in order"""
+    print("🔧 Available lightweight TTS models:")
+    print("=" * 60)
+
+    # For Hindi, we'll need to use pyttsx3 or look for alternatives
+    print("\n⚠️  Note: Lightweight models are mostly English-only")
+    print("For Hindi support offline, we'll use pyttsx3 or need XTTS-v2 (2GB)\n")
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    print("\n🎤 Testing lightweight models...")
+    print("=" * 60)
+
+    # The next model is downloaded and synthesized by the worker while the
+    # current sample plays and is rated; maxsize bounds how far it runs ahead.
+    ctx = mp.get_context("spawn")
+    jobs, results = ctx.Queue(), ctx.Queue(maxsize=2)
+    worker = ctx.Process(target=tts_worker, args=(jobs, results), daemon=True)
+    worker.start()
+
+    for model_info in models_to_test:
+        model_name = model_info["name"]
+        jobs.put((model_name, f"{output_dir}/{model_name.replace('/', '_')}.wav"))
+    jobs.put(None)
+
+    # Full init (not just the mixer): the event queue needs the video subsystem
+    pygame.init()
+    pygame.mixer.music.set_endevent(MUSIC_END)
+
+    for model_info in models_to_test:
+        output_file, error = next_result(results, worker)
+        model_name = model_info["name"]
+        print(f"\n📦 Model: {model_name}")
+        print(f"   Size: {model_info['size']}")
+        print(f"   Description: {model_info['description']}")
+
+        if error is not None:
+            print(f"   ❌ Error: {error}")
+            continue
+
         print(f"   ✅ Generated: {output_file}")
-        
+
         # Play sample
-        import pygame
-        pygame.mixer.init()
-        pygame.mixer.music.load(output_file)
-        pygame.mixer.music.play()
-        
-        while pygame.mixer.music.get_busy():
-            pygame.time.Clock().tick(10)
-        
+        try:
+            pygame.mixer.music.load(output_file)
+            pygame.mixer.music.play()
+        except Exception as e:
+            print(f"   ❌ Error: {e}")
+            continue
+
+        # Block on the end event instead of polling get_busy()
+        while pygame.event.wait().type != MUSIC_END:
+            pass
+
         rating = input(f"\n   Rate this voice (1-5 stars): ")
         print(f"   ⭐ Rating: {rating}/5")
-        
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
 
-print("\n" + "=" * 60)
-print("💡 Recommendation:")
-print("   For BEST quality with Hindi support: Keep trying XTTS-v2 download")
-print("   For FAST lightweight: Use pyttsx3 (already working)")
-print(f"\n📁 Samples saved to: {output_dir}")
+    print("\n" + "=" * 60)
+    print("💡 Recommendation:")
+    print("   For BEST quality with Hindi support: Keep trying XTTS-v2 download")
+    print("   For FAST lightweight: Use pyttsx3 (already working)")
+    print(f"\n📁 Samples saved to: {output_dir}")
+    
+    worker.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,26 @@ Test microphone input and show audio levels in real-time.
 Use this to verify your microphone is working before testing voice loop.
 """
 
+import os
 import pyaudio
-import struct
 import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.core.audio_io import rms_energy
 
 CHUNK = 1024
 FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 16000
 
+# Level meter: 50-cell bars prebuilt for every length, redrawn at most 10x/sec
+BARS = ["█" * i + " " * (50 - i) for i in range(51)]
+UI_REFRESH_SECONDS = 0.1
+
+
 def test_microphone():
     """Test microphone and display audio levels."""
     print("\n" + "="*70)
@@ -50,18 +61,20 @@ def test_microphone():
         
         print("✅ Microphone connected - Listening...\n")
         
+        next_render = 0.0
+        
         # Monitor audio levels
         while True:
             try:
                 data = stream.read(CHUNK, exception_on_overflow=False)
                 
                 # Calculate RMS energy
-                audio_samples = struct.unpack(f"{len(data)//2}h", data)
-                energy = int((sum(sample**2 for sample in audio_samples) / len(audio_samples))**0.5)
+                energy = rms_energy(data)
                 
-                # Visual meter
-                bar_length = min(50, energy // 20)
-                bar = "█" * bar_length
+                now = time.monotonic()
+                if now < next_render:
+                    continue
+                next_render = now + UI_REFRESH_SECONDS
                 
                 # Color coding with updated thresholds
                 if energy > 2000:
@@ -73,8 +86,9 @@ def test_microphone():
                 else:
                     status = "🔇 Silence        "
                 
-                # Print meter (overwrite previous line)
-                print(f"\r{status} | Energy: {energy:5d} | {bar:50}", end="", flush=True)
+                # Print meter (overwrite previous line) - stderr is unbuffered
+                sys.stderr.write(f"\r{status} | Energy: {energy:5d} | {BARS[min(50, energy // 20)]}")
+                sys.stderr.flush()
                 
             except Exception as e:
                 print(f"\n❌ Error reading audio: {e}")
@@ -3,8 +3,11 @@ MongoDB Connection Test
 Tests MongoDB connectivity, databases, collections, and operations.
 """
 
+import asyncio
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from colorama import init, Fore, Style
 from datetime import datetime
 
@@ -29,6 +32,50 @@ def print_info(message):
     """Print info message"""
     print(f"{Fore.YELLOW}ℹ {message}{Style.RESET_ALL}")
 
+def _coll_stats(db, name):
+    """collStats for one collection, or None if it doesn't exist yet"""
+    try:
+        return db.command("collStats", name)
+    except Exception:
+        return None
+
+
+def run_async_crud(mongo_uri, db_name, pool_options):
+    """
+    CREATE / READ / SEARCH issued concurrently over motor (run with --async).
+    
+    The three operations are pipelined in one asyncio.gather, so the reads
+    may or may not see the document being inserted alongside them.
+    """
+    try:
+        import motor.motor_asyncio
+    except ImportError:
+        print_info("ASYNC: motor not installed - skipping (pip install motor)")
+        return
+    
+    async def crud():
+        client = motor.motor_asyncio.AsyncIOMotorClient(mongo_uri, **pool_options)
+        try:
+            col = client[db_name].conversations
+            doc = {
+                "timestamp": datetime.utcnow(),
+                "user_query": "Test: async CRUD",
+                "jarvis_response": f"Async test response at {datetime.now().strftime('%H:%M:%S')}",
+                "intent": "test",
+            }
+            start = time.perf_counter()
+            _, recent, found = await asyncio.gather(
+                col.insert_one(doc),
+                col.find({}, {"_id": 0}).sort("timestamp", -1).limit(5).to_list(5),
+                col.find({"user_query": {"$regex": "test", "$options": "i"}}, {"_id": 0}).limit(3).to_list(3),
+            )
+            return recent, found, time.perf_counter() - start
+        finally:
+            client.close()
+    
+    recent, found, elapsed = asyncio.run(crud())
+    print_success(f"✓ ASYNC: insert + read {len(recent)} + search {len(found)} in {elapsed*1000:.1f} ms")
+
 
 def test_mongodb():
     """Test MongoDB connection and operations"""
@@ -71,6 +118,9 @@ def test_mongodb():
         # Get connection info
         mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017/jarvis_db")
         print_info(f"URI: {mongo_uri}")
+        pool = mongo_manager.POOL_OPTIONS
+        print_info(f"Pool: min {pool['minPoolSize']} / max {pool['maxPoolSize']} connections, "
+                   f"compressors: {pool['compressors']}")
         
     except Exception as e:
         print_error(f"Connection failed: {e}")
@@ -95,7 +145,7 @@ def test_mongodb():
         collections = db.list_collection_names()
         print_success(f"Collections found: {len(collections)}")
         for col in collections:
-            count = db[col].count_documents({})
+            count = db[col].estimated_document_count()
             print(f"  - {col}: {count} documents")
         
     except Exception as e:
@@ -135,6 +185,40 @@ def test_mongodb():
         except AttributeError:
             print_info("SEARCH: search_history not implemented yet (optional)")
         
+        # Test bulk insert: one unacknowledged round-trip for the whole batch,
+        # into a scratch collection so real history is not polluted
+        from pymongo import InsertOne
+        from pymongo.write_concern import WriteConcern
+        
+        BULK_DOCS = 1000
+        docs = [
+            {
+                "user_query": f"bulk test {i}",
+                "jarvis_response": "bulk test response",
+                "intent": "test",
+                "timestamp": datetime.utcnow(),
+            }
+            for i in range(BULK_DOCS)
+        ]
+        db.drop_collection("bulk_insert_test")  # Leftovers from an interrupted run
+        bulk_col = db.bulk_insert_test.with_options(write_concern=WriteConcern(w=0))
+        start = time.perf_counter()
+        bulk_col.bulk_write([InsertOne(doc) for doc in docs], ordered=False)
+        sent = time.perf_counter() - start
+        
+        # w=0 returns once the batch is on the socket; wait for the server to apply
+        # it, or a late insert could recreate the collection after the drop
+        deadline = time.monotonic() + 10
+        while db.bulk_insert_test.count_documents({}) < BULK_DOCS and time.monotonic() < deadline:
+            time.sleep(0.05)
+        applied = time.perf_counter() - start
+        print_success(f"✓ BULK: Sent {BULK_DOCS} inserts in {sent*1000:.1f} ms (w=0, send only), "
+                      f"applied after {applied*1000:.1f} ms")
+        db.drop_collection("bulk_insert_test")
+        
+        if "--async" in sys.argv:
+            run_async_crud(mongo_uri, db.name, mongo_manager.POOL_OPTIONS)
+        
         print_success("All CRUD operations working!")
         
     except Exception as e:
@@ -147,11 +231,12 @@ def test_mongodb():
     try:
         db = mongo_manager._db
         
-        # Check conversation_history indexes
-        conv_indexes = list(db.conversation_history.list_indexes())
-        print_success(f"conversation_history indexes: {len(conv_indexes)}")
+        # Check conversations indexes (timestamp index is TTL if CONVERSATION_TTL_DAYS is set)
+        conv_indexes = list(db.conversations.list_indexes())
+        print_success(f"conversations indexes: {len(conv_indexes)}")
         for idx in conv_indexes:
-            print(f"  - {idx['name']}")
+            ttl = idx.get('expireAfterSeconds')
+            print(f"  - {idx['name']}" + (f" (TTL: {ttl // 86400} days)" if ttl else ""))
         
         # Check pdf_summaries indexes
         pdf_indexes = list(db.pdf_summaries.list_indexes())
@@ -168,21 +253,30 @@ def test_mongodb():
     try:
         db = mongo_manager._db
         
-        # Get stats for each collection
-        for collection_name in ['conversation_history', 'pdf_summaries', 'alarms']:
-            try:
-                stats = db.command("collStats", collection_name)
-                count = stats.get('count', 0)
-                size = stats.get('size', 0)
-                avg_size = stats.get('avgObjSize', 0)
-                
-                print(f"\n{Fore.YELLOW}{collection_name}:{Style.RESET_ALL}")
-                print(f"  Documents: {count}")
-                print(f"  Size: {size} bytes ({size/1024:.2f} KB)")
-                if count > 0:
-                    print(f"  Avg doc size: {avg_size} bytes")
-            except Exception as e:
+        # Whole-database totals in one command
+        db_stats = db.command("dbStats", scale=1)
+        print_success(f"Database: {db_stats.get('objects', 0)} documents, "
+                      f"{db_stats.get('dataSize', 0)/1024:.2f} KB in {db_stats.get('collections', 0)} collections")
+        
+        # Get stats for each collection (issued concurrently, printed in order)
+        collection_names = ['conversation_history', 'pdf_summaries', 'alarms']
+        with ThreadPoolExecutor(max_workers=len(collection_names)) as executor:
+            all_stats = list(executor.map(lambda name: _coll_stats(db, name), collection_names))
+        
+        for collection_name, stats in zip(collection_names, all_stats):
+            if stats is None:
                 print_info(f"{collection_name}: Collection doesn't exist yet (empty)")
+                continue
+            
+            count = stats.get('count', 0)
+            size = stats.get('size', 0)
+            avg_size = stats.get('avgObjSize', 0)
+            
+            print(f"\n{Fore.YELLOW}{collection_name}:{Style.RESET_ALL}")
+            print(f"  Documents: {count}")
+            print(f"  Size: {size} bytes ({size/1024:.2f} KB)")
+            if count > 0:
+                print(f"  Avg doc size: {avg_size} bytes")
         
     except Exception as e:
         print_error(f"Stats failed: {e}")
@@ -1,4 +1,5 @@
 import sys
+from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0, r'c:\Users\Lunar Panda\3-Main\assistant')
 from backend.core.brain import process_command
 
@@ -14,10 +15,14 @@ tests = [
     ('Open GitHub', 'open github.com'),
 ]
 
-for i, (name, cmd) in enumerate(tests, 1):
+# Commands are dominated by network/browser latency - dispatch them all at
+# once, then print the results in test order
+with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+    results = list(executor.map(lambda test: process_command(test[1]), tests))
+
+for i, ((name, cmd), result) in enumerate(zip(tests, results), 1):
     print(f'{i}. {name}')
     print(f'   Command: "{cmd}"')
-    result = process_command(cmd)
     print(f'   Response: {result["response"]}')
     print(f'   Success: {result["success"]}\n')
 
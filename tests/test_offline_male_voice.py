@@ -11,7 +11,7 @@ from colorama import init, Fore, Style
 init(autoreset=True)
 
 from core import tts_offline
-import subprocess
+from core.audio_io import play_file
 
 
 def test_offline_voice():
@@ -57,7 +57,7 @@ def test_offline_voice():
             
             # Play audio
             print(f"  Playing...")
-            subprocess.run(['start', audio_path], shell=True)
+            play_file(audio_path)
             
             response = input(f"\n  {Fore.CYAN}Is this a MALE voice? (y/n): {Style.RESET_ALL}")
             
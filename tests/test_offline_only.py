@@ -9,7 +9,8 @@ from colorama import init, Fore, Style
 init(autoreset=True)
 
 from core import tts_offline
-import subprocess
+from core.audio_io import play_file
+
 
 print("\n" + "="*70)
 print("  OFFLINE VOICE TEST (Microsoft David - Tuned to Arjun Speed)")
@@ -43,7 +44,7 @@ for i, text in enumerate(test_cases, 1):
         
         # Play audio
         print(f"  Playing...")
-        subprocess.run(['start', audio_path], shell=True)
+        play_file(audio_path, wait=(i == len(test_cases)))
         
         if i < len(test_cases):
             cont = input(f"\n  {Fore.YELLOW}Continue to next? (y/n): {Style.RESET_ALL}")
@@ -18,6 +18,8 @@ import pyaudioinit(autoreset=True)
 
 import time
 
+import numpy as np
+
 from dotenv import load_dotenvfrom core import tts_offline
 
 import subprocess
@@ -113,10 +115,15 @@ FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 16000
 RECORD_SECONDS = 5
-OUTPUT_FILE = "test_offline_audio.wav"
 
 audio = pyaudio.PyAudio()
 
+# Load and warm up faster-whisper before recording, so the STT time
+# measured in Step 3 is steady-state rather than first-call cost
+print("\n   ⏳ Loading faster-whisper (first run downloads the model, one-time only)...")
+if stt_local.warmup():
+    print("   ✅ faster-whisper warmed up")
+
 print("\n   You can test these skills (works offline):")
 print("   • 'What time is it?'")
 print("   • 'What's the date today?'")
@@ -134,24 +141,36 @@ print(f"\n🔴 SPEAK NOW! ({RECORD_SECONDS} seconds)")
 print("   Recording...\n")
 
 try:
+    # Capture runs on PortAudio's I/O thread: the callback copies each
+    # buffer straight into one preallocated array, the main thread only
+    # reads the write index to draw the progress bar.
+    recording = np.zeros(RATE * RECORD_SECONDS, dtype=np.int16)
+    write_pos = [0]
+    
+    def on_audio(in_data, frame_count, time_info, status):
+        start = write_pos[0]
+        n = min(frame_count, len(recording) - start)
+        recording[start:start + n] = np.frombuffer(in_data, dtype=np.int16, count=n)
+        write_pos[0] = start + n
+        if write_pos[0] >= len(recording):
+            return (None, pyaudio.paComplete)
+        return (None, pyaudio.paContinue)
+    
     stream = audio.open(
         format=FORMAT,
         channels=CHANNELS,
         rate=RATE,
         input=True,
-        frames_per_buffer=CHUNK
+        frames_per_buffer=CHUNK,
+        stream_callback=on_audio
     )
     
-    frames = []
-    total = int(RATE / CHUNK * RECORD_SECONDS)
-    
-    for i in range(total):
-        data = stream.read(CHUNK)
-        frames.append(data)
-        if i % 10 == 0:
-            percent = int((i / total) * 100)
-            bars = "█" * (percent // 5)
-            print(f"   [{bars:<20}] {percent}%", end='\r')
+    while stream.is_active():
+        percent = write_pos[0] * 100 // len(recording)
+        bars = "█" * (percent // 5)
+        sys.stderr.write(f"   [{bars:<20}] {percent}%\r")
+        sys.stderr.flush()
+        time.sleep(0.1)
     
     print(f"\n   [{'█' * 20}] 100%")
     print("\n✅ Recording complete!")
@@ -159,21 +178,13 @@ try:
     stream.stop_stream()
     stream.close()
     
-    # Save
-    wf = wave.open(OUTPUT_FILE, 'wb')
-    wf.setnchannels(CHANNELS)
-    wf.setsampwidth(audio.get_sample_size(FORMAT))
-    wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
-    wf.close()
-    
     # Test 3: STT (faster-whisper OFFLINE)
     print("\n📝 Step 3: Transcribing with faster-whisper (OFFLINE)...")
     print("-" * 70)
-    print("   ⏳ First run will download ~140MB model (one-time only)...")
     
     start_time = time.time()
-    text = stt_local.transcribe_file(OUTPUT_FILE, method="whisper")
+    # Hand the recording straight to whisper as float32 (no WAV round-trip)
+    text = stt_local.transcribe_array(recording.astype(np.float32) / 32768.0)
     stt_time = time.time() - start_time
     
     print(f"\n   YOU SAID: \"{text}\"")
@@ -239,10 +250,6 @@ try:
     except Exception as e:
         print(f"   ⚠️  Save failed: {e}")
     
-    # Clean up
-    if os.path.exists(OUTPUT_FILE):
-        os.remove(OUTPUT_FILE)
-    
     # Summary
     total_time = stt_time + brain_time + tts_time
     
@@ -5,18 +5,27 @@ Tests: Microphone → Groq Whisper (STT) → Qwen (Brain) → Edge TTS Arjun
 
 import os
 import sys
-import wave
 import pyaudio
 import time
 from dotenv import load_dotenv
 
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None  # Without VAD the full RECORD_SECONDS is recorded
+
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 # Load environment from backend/.env
 load_dotenv('backend/.env')
 
-from backend.core import stt_online, brain, tts_manager, mongo_manager
+from backend.core import audio_io, stt_online, brain, tts_manager, mongo_manager
+from backend.core.audio_io import record_utterance
+from backend.core.tts_online import open_playback, play_until_end
+
+# Open the audio device once at 24 kHz with a small buffer, and wait on its end event
+open_playback()
 
 print("=" * 70)
 print("🌐 JARVIS ONLINE VOICE PIPELINE TEST")
@@ -56,14 +65,21 @@ if not tts_status['internet']:
 print("\n🎤 Step 2: Recording your voice...")
 print("-" * 70)
 
-CHUNK = 1024
 FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 16000
-RECORD_SECONDS = 5
-OUTPUT_FILE = "test_online_audio.wav"
+RECORD_SECONDS = 5                            # Upper bound, recording stops early on silence
+CHUNK_DURATION_MS = 20                        # webrtcvad accepts 10/20/30 ms frames only
+CHUNK = RATE * CHUNK_DURATION_MS // 1000      # 320 samples
+END_SILENCE_CHUNKS = 300 // CHUNK_DURATION_MS  # 300 ms of trailing silence ends the utterance
+VAD_MODE = 2
+vad = webrtcvad.Vad(VAD_MODE) if webrtcvad else None  # shared by every recorded turn
+
+audio = audio_io.get_pyaudio()  # shared PortAudio session, terminated at exit
+
+# Host buffer probed once per device (cached in ~/.jarvis); reads stay CHUNK-sized for the VAD
+BUFFER_SIZE = audio_io.preferred_buffer_size(audio, RATE, CHANNELS)
 
-audio = pyaudio.PyAudio()
 
 print("\n   You can test these skills:")
 print("   • 'What time is it?'")
@@ -80,7 +96,7 @@ for i in range(3, 0, -1):
     print(f"   {i}...")
     time.sleep(1)
 
-print(f"\n🔴 SPEAK NOW! ({RECORD_SECONDS} seconds)")
+print(f"\n🔴 SPEAK NOW! (up to {RECORD_SECONDS} seconds, stops when you pause)")
 print("   Recording...\n")
 
 try:
@@ -89,40 +105,24 @@ try:
         channels=CHANNELS,
         rate=RATE,
         input=True,
-        frames_per_buffer=CHUNK
+        frames_per_buffer=BUFFER_SIZE
     )
     
-    frames = []
-    total = int(RATE / CHUNK * RECORD_SECONDS)
+    pcm = record_utterance(stream, RATE, CHUNK, RECORD_SECONDS, vad, END_SILENCE_CHUNKS)
     
-    for i in range(total):
-        data = stream.read(CHUNK)
-        frames.append(data)
-        if i % 10 == 0:
-            percent = int((i / total) * 100)
-            bars = "█" * (percent // 5)
-            print(f"   [{bars:<20}] {percent}%", end='\r')
-    
-    print(f"\n   [{'█' * 20}] 100%")
+    print(f"\n   [{'█' * 20}] {len(pcm) / (RATE * 2):.1f}s")
     print("\n✅ Recording complete!")
     
     stream.stop_stream()
     stream.close()
     
-    # Save
-    wf = wave.open(OUTPUT_FILE, 'wb')
-    wf.setnchannels(CHANNELS)
-    wf.setsampwidth(audio.get_sample_size(FORMAT))
-    wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
-    wf.close()
-    
     # Test 3: STT (Groq Whisper)
     print("\n📝 Step 3: Transcribing with Groq Whisper...")
     print("-" * 70)
     
     start_time = time.time()
-    text = stt_online.transcribe_online(OUTPUT_FILE)
+    result = stt_online.transcribe_bytes(pcm, RATE)
+    text = result.get("text", "") if isinstance(result, dict) else result
     stt_time = time.time() - start_time
     
     print(f"\n   YOU SAID: \"{text}\"")
@@ -171,31 +171,22 @@ try:
         
         # Play audio
         print("\n   🔊 Playing audio...")
-        if audio_path.endswith('.mp3'):
-            from pygame import mixer
-            mixer.init()
-            mixer.music.load(audio_path)
-            mixer.music.play()
-            while mixer.music.get_busy():
-                time.sleep(0.1)
-        elif audio_path.endswith('.wav'):
-            import winsound
-            winsound.PlaySound(audio_path, winsound.SND_FILENAME)
+        play_until_end(audio_path)  # mp3 (Edge) and wav (offline fallbacks) share the open mixer
     
     # Test 6: MongoDB save
     print("\n💾 Step 6: Saving to MongoDB...")
     print("-" * 70)
     
     try:
-        mongo_manager.save_conversation(text, response, intent)
-        print("   ✅ Conversation saved")
+        mongo_manager.log_conversation({
+            "user_query": text,
+            "jarvis_response": response,
+            "intent": intent,
+        })
+        print("   ✅ Conversation queued (written in the background)")
     except Exception as e:
         print(f"   ⚠️  Save failed: {e}")
     
-    # Clean up
-    if os.path.exists(OUTPUT_FILE):
-        os.remove(OUTPUT_FILE)
-    
     # Summary
     total_time = stt_time + brain_time + tts_time
     
@@ -217,6 +208,3 @@ except Exception as e:
     print(f"\n❌ ERROR: {e}")
     import traceback
     traceback.print_exc()
-
-finally:
-    audio.terminate()
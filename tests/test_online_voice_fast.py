@@ -3,25 +3,37 @@ TEST ONLINE VOICE PIPELINE - OPTIMIZED FOR SPEED
 Optimizations:
 1. Async MongoDB saves (non-blocking)
 2. Reduced recording time (3s instead of 5s)
-3. Parallel processing where possible
-4. Streaming TTS (play while generating)
+3. Pipelined stages (capture → STT → brain → TTS over asyncio queues)
+4. Streaming TTS (each sentence is synthesized while the LLM is still generating)
 """
 
+import asyncio
 import os
+import re
 import sys
-import wave
 import pyaudio
 import time
-import threading
+import winsound
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None  # Without VAD the full RECORD_SECONDS is recorded
+
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 # Load environment from backend/.env
 load_dotenv('backend/.env')
 
-from backend.core import stt_online, brain, tts_manager, tts_online, mongo_manager
+from backend.core import audio_io, stt_online, brain, tts_manager, tts_streaming, mongo_manager
+from backend.core.audio_io import record_utterance
+from backend.core.tts_online import open_playback, play_until_end
+
+# Open the audio device once at 24 kHz with a small buffer, and wait on its end event
+open_playback()
 
 print("=" * 70)
 print("🌐 JARVIS ONLINE VOICE PIPELINE - SPEED OPTIMIZED")
@@ -54,14 +66,176 @@ print(f"   TTS: {tts_status['recommended_engine']}")
 print("\n🎤 Recording your voice (3 seconds)...")
 print("-" * 70)
 
-CHUNK = 1024
 FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 16000
-RECORD_SECONDS = 5  # ⚡ 5 seconds for full sentence
-OUTPUT_FILE = "test_fast_audio.wav"
+RECORD_SECONDS = 5  # ⚡ Upper bound, recording stops as soon as you pause
+CHUNK_DURATION_MS = 20                        # webrtcvad accepts 10/20/30 ms frames only
+CHUNK = RATE * CHUNK_DURATION_MS // 1000      # 320 samples
+END_SILENCE_CHUNKS = 300 // CHUNK_DURATION_MS  # 300 ms of trailing silence ends the utterance
+VAD_MODE = 2
+vad = webrtcvad.Vad(VAD_MODE) if webrtcvad else None  # shared by every recorded turn
+TURNS = 1  # >1: the next turn is captured while the previous reply is still processed/spoken (use headphones)
+
+# Streamed replies are flushed to TTS at each sentence end, or after
+# MAX_CHUNKS_PER_SENTENCE chunks without one
+SENTENCE_END = re.compile(r'[.?!।]\s*$')
+MAX_CHUNKS_PER_SENTENCE = 80
+END_OF_TURN = object()  # Marker between turns on the TTS queue
+
+audio = audio_io.get_pyaudio()  # shared PortAudio session, terminated at exit
+
+# Host buffer probed once per device (cached in ~/.jarvis); reads stay CHUNK-sized for the VAD
+BUFFER_SIZE = audio_io.preferred_buffer_size(audio, RATE, CHANNELS)
+
+
+# ============================================================================
+# PIPELINE: capture → STT → brain → TTS, one coroutine per stage
+# ============================================================================
+# Stages hand work over asyncio queues (None = end of input) and run their
+# blocking calls in threads, so with TURNS > 1 each stage works on a
+# different turn at the same time.
+
+async def capture_stage(stream, q_audio):
+    """Record TURNS utterances back to back"""
+    for _ in range(TURNS):
+        print(f"\n🔴 RECORDING NOW - SPEAK CLEARLY! (up to {RECORD_SECONDS} seconds)")
+        print("   ", end="", flush=True)
+        await asyncio.to_thread(winsound.Beep, 1000, 200)  # Beep to indicate start
+        
+        # Record with visual progress until you pause
+        pcm = await asyncio.to_thread(record_utterance, stream, RATE, CHUNK, RECORD_SECONDS, vad, END_SILENCE_CHUNKS)
+        print(f"\r   [{'█' * 20}] {len(pcm) / (RATE * 2):.1f}s")
+        
+        await asyncio.to_thread(winsound.Beep, 800, 200)  # Lower tone for the end
+        print("\n✅ Recording complete!")
+        await q_audio.put(pcm)
+    
+    await q_audio.put(None)
+
+
+async def stt_stage(q_audio, q_text, timings):
+    """Groq Whisper transcription"""
+    while (pcm := await q_audio.get()) is not None:
+        print("\n📝 Transcribing...")
+        
+        start = time.time()
+        result = await asyncio.to_thread(stt_online.transcribe_bytes, pcm, RATE)
+        text = result.get("text", "") if isinstance(result, dict) else result
+        elapsed = time.time() - start
+        timings["stt"] += elapsed
+        
+        print(f'   YOU: "{text}"')
+        print(f"   ⏱️  {elapsed:.2f}s")
+        
+        if not text or "[" in text:
+            print("❌ Transcription failed!")
+            continue
+        await q_text.put(text)
+    
+    await q_text.put(None)
+
+
+async def brain_stage(q_text, q_reply, timings):
+    """
+    Stream the reply from the brain and start synthesizing each sentence as
+    soon as it is complete, while the rest of the reply is still generated.
+    Synthesis tasks are queued in sentence order; the MongoDB save is
+    fire-and-forget.
+    """
+    loop = asyncio.get_running_loop()
+    
+    while (text := await q_text.get()) is not None:
+        print("\n🧠 Processing...")
+        start = time.time()
+        
+        # brain.stream_command is a blocking iterator - pump it from a thread
+        chunks = asyncio.Queue()
+        
+        def pump():
+            try:
+                for chunk in brain.stream_command(text):
+                    loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, None)
+        
+        producer = asyncio.create_task(asyncio.to_thread(pump))
+        
+        reply, sentence = [], []
+        while (chunk := await chunks.get()) is not None:
+            reply.append(chunk)
+            sentence.append(chunk)
+            combined = "".join(sentence)
+            if SENTENCE_END.search(combined) or len(sentence) >= MAX_CHUNKS_PER_SENTENCE:
+                if combined.strip():
+                    audio = asyncio.create_task(tts_streaming.generate_audio_async(combined.strip()))
+                    await q_reply.put((audio, start))
+                sentence.clear()
+        
+        if "".join(sentence).strip():
+            audio = asyncio.create_task(tts_streaming.generate_audio_async("".join(sentence).strip()))
+            await q_reply.put((audio, start))
+        await q_reply.put(END_OF_TURN)
+        await producer
+        
+        elapsed = time.time() - start
+        timings["brain"] += elapsed
+        response = "".join(reply).strip()
+        
+        print(f'   JARVIS: "{response}"')
+        print(f"   ⏱️  {elapsed:.2f}s")
+        
+        mongo_manager.log_conversation({  # batched background write, flushed at exit
+            "user_query": text,
+            "jarvis_response": response,
+            "intent": "chat",
+        })
+    
+    await q_reply.put(None)
+
+
+async def tts_stage(q_reply, timings):
+    """Play synthesized sentences strictly in the order they were queued"""
+    first_in_turn = True
+    
+    while (item := await q_reply.get()) is not None:
+        if item is END_OF_TURN:
+            timings["turns"] += 1
+            first_in_turn = True
+            continue
+        
+        audio, turn_start = item
+        start = time.time()
+        audio_path = await audio
+        
+        if audio_path:
+            if first_in_turn:
+                print(f"\n🔊 Speaking... (first audio after {time.time() - turn_start:.2f}s)")
+                first_in_turn = False
+            
+            await asyncio.to_thread(play_until_end, audio_path)
+            # Clean up audio file
+            try:
+                os.remove(audio_path)
+            except OSError:
+                pass
+        
+        timings["tts"] += time.time() - start
+
+
+async def run_pipeline(stream):
+    """Run all stages concurrently; returns per-stage time totals"""
+    q_audio, q_text, q_reply = asyncio.Queue(), asyncio.Queue(), asyncio.Queue()
+    timings = {"stt": 0.0, "brain": 0.0, "tts": 0.0, "turns": 0}
+    
+    await asyncio.gather(
+        capture_stage(stream, q_audio),
+        stt_stage(q_audio, q_text, timings),
+        brain_stage(q_text, q_reply, timings),
+        tts_stage(q_reply, timings),
+    )
+    return timings
 
-audio = pyaudio.PyAudio()
 
 print("\n   Test phrases:")
 print("   • 'What time is it?'")
@@ -70,132 +244,43 @@ print("   • 'Open Chrome'")
 
 input("\n   ⚠️  Press ENTER when ready to speak (you'll have 3 seconds to prepare)...")
 
-# Clear countdown
-print("\n   Get ready...")
-time.sleep(1)
-print("   3...")
-time.sleep(1)
-print("   2...")
-time.sleep(1)
-print("   1...")
-time.sleep(1)
+# Open the microphone stream (paused) and the Groq connection during the
+# countdown, so neither is paid for after the user starts speaking
+setup = ThreadPoolExecutor(2)
+stream_ready = setup.submit(
+    audio.open,
+    format=FORMAT,
+    channels=CHANNELS,
+    rate=RATE,
+    input=True,
+    frames_per_buffer=BUFFER_SIZE,
+    start=False
+)
+setup.submit(stt_online.prewarm)
 
-print(f"\n🔴 RECORDING NOW - SPEAK CLEARLY! ({RECORD_SECONDS} seconds)")
-print("   ", end="", flush=True)
-
-# Beep to indicate start
-import winsound
-winsound.Beep(1000, 200)  # 1000Hz for 200ms
+# Clear countdown, ticked against one fixed start time
+countdown_start = time.monotonic()
+for i, label in enumerate(["\n   Get ready...", "   3...", "   2...", "   1..."]):
+    time.sleep(max(0.0, countdown_start + i - time.monotonic()))
+    print(label)
+time.sleep(max(0.0, countdown_start + 4 - time.monotonic()))
 
 start_total = time.time()
 
 try:
-    stream = audio.open(
-        format=FORMAT,
-        channels=CHANNELS,
-        rate=RATE,
-        input=True,
-        frames_per_buffer=CHUNK
-    )
-    
-    frames = []
-    total = int(RATE / CHUNK * RECORD_SECONDS)
+    stream = stream_ready.result()
+    setup.shutdown(wait=False)
+    stream.start_stream()
     
-    # Record with visual progress
-    for i in range(total):
-        data = stream.read(CHUNK)
-        frames.append(data)
-        
-        # Show progress every 0.5 seconds
-        if i % 10 == 0:
-            percent = int((i / total) * 100)
-            bars = "█" * (percent // 5)
-            spaces = "░" * (20 - (percent // 5))
-            print(f"\r   [{bars}{spaces}] {percent}%", end="", flush=True)
-    
-    # Final progress
-    print(f"\r   [{'█' * 20}] 100%")
-    
-    # Beep to indicate end
-    winsound.Beep(800, 200)  # Lower tone
-    
-    print("\n✅ Recording complete!")
+    timings = asyncio.run(run_pipeline(stream))
     
     stream.stop_stream()
     stream.close()
     
-    # Save
-    wf = wave.open(OUTPUT_FILE, 'wb')
-    wf.setnchannels(CHANNELS)
-    wf.setsampwidth(audio.get_sample_size(FORMAT))
-    wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
-    wf.close()
-    
-    # Test 3: STT (Groq Whisper)
-    print("\n📝 Transcribing...")
-    
-    start_stt = time.time()
-    text = stt_online.transcribe_online(OUTPUT_FILE)
-    stt_time = time.time() - start_stt
-    
-    print(f'   YOU: "{text}"')
-    print(f"   ⏱️  {stt_time:.2f}s")
-    
-    if not text or "[" in text:
-        print("❌ Transcription failed!")
+    if timings["turns"] == 0:
         exit(1)
     
-    # Test 4: Brain Processing
-    print("\n🧠 Processing...")
-    
-    start_brain = time.time()
-    result = brain.process_command(text)
-    brain_time = time.time() - start_brain
-    
-    if isinstance(result, dict):
-        response = result.get('response', str(result))
-        intent = result.get('intent', 'unknown')
-    else:
-        response = result
-        intent = 'unknown'
-    
-    print(f'   JARVIS: "{response}"')
-    print(f"   ⏱️  {brain_time:.2f}s")
-    
-    # Test 5: TTS + MongoDB in PARALLEL (non-blocking)
-    print("\n🔊 Speaking...")
-    
-    # Start MongoDB save in background thread (non-blocking)
-    def save_async():
-        try:
-            mongo_manager.save_conversation(text, response, intent)
-        except:
-            pass
-    
-    save_thread = threading.Thread(target=save_async, daemon=True)
-    save_thread.start()
-    
-    start_tts = time.time()
-    audio_path, engine = tts_manager.speak(response, lang='en', prefer_offline=False)
-    
-    if audio_path:
-        # Play the audio using the tts_online play function
-        tts_online.play_audio(audio_path)
-        # Clean up audio file
-        try:
-            os.remove(audio_path)
-        except:
-            pass
-    
-    tts_time = time.time() - start_tts
-    
-    print(f"   Engine: {engine}")
-    print(f"   ⏱️  {tts_time:.2f}s")
-    
-    # Clean up
-    if os.path.exists(OUTPUT_FILE):
-        os.remove(OUTPUT_FILE)
+    stt_time, brain_time, tts_time = timings["stt"], timings["brain"], timings["tts"]
     
     # Summary
     total_time = time.time() - start_total
@@ -225,6 +310,3 @@ except Exception as e:
     print(f"\n❌ ERROR: {e}")
     import traceback
     traceback.print_exc()
-
-finally:
-    audio.terminate()
@@ -2,6 +2,29 @@
 Test Piper TTS directly to understand its API
 """
 import tempfile
+import time
+import winsound
+from functools import lru_cache
+
+
+@lru_cache(maxsize=2)
+def get_voice(name):
+    """Load a Piper voice once; later calls reuse the same ONNX session"""
+    from piper.voice import PiperVoice
+    return PiperVoice.load(name)
+
+
+def synthesize(voice, text):
+    """Synthesize text to a temporary WAV file and return its path"""
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
+    output_path = temp_file.name
+    temp_file.close()
+    
+    with open(output_path, 'wb') as f:
+        voice.synthesize(text, f)
+    
+    return output_path
+
 
 print("\n" + "="*70)
 print("  TESTING PIPER TTS DIRECTLY")
@@ -37,22 +60,23 @@ try:
     # Try to load voice
     print("Loading voice: en_US-lessac-medium...")
     try:
-        voice = PiperVoice.load("en_US-lessac-medium")
-        print("✓ Voice loaded!")
+        start = time.perf_counter()
+        voice = get_voice("en_US-lessac-medium")
+        print(f"✓ Voice loaded! ({time.perf_counter() - start:.2f}s)")
         
         # Synthesize
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-        output_path = temp_file.name
-        temp_file.close()
-        
-        with open(output_path, 'wb') as f:
-            voice.synthesize(text, f)
+        start = time.perf_counter()
+        output_path = synthesize(voice, text)
+        print(f"✓ Audio generated: {output_path} ({time.perf_counter() - start:.2f}s)")
         
-        print(f"✓ Audio generated: {output_path}")
-        
-        import subprocess
-        subprocess.run(['start', output_path], shell=True)
         print("\n✨ Piper TTS works! Playing audio...")
+        winsound.PlaySound(output_path, winsound.SND_FILENAME)
+        
+        # Second request: the cached voice is reused, so only synthesis is paid
+        start = time.perf_counter()
+        output_path = synthesize(get_voice("en_US-lessac-medium"), "Second sentence, same voice.")
+        print(f"✓ Cached voice reused: {output_path} ({time.perf_counter() - start:.2f}s)")
+        winsound.PlaySound(output_path, winsound.SND_FILENAME)
         
     except FileNotFoundError as e:
         print(f"✗ Voice model not found: {e}")
@@ -6,7 +6,8 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 from core import tts_manager
-import subprocess
+from core.audio_io import play_file
+
 
 print("\n" + "="*70)
 print("  QUICK OFFLINE MALE VOICE TEST")
@@ -24,7 +25,7 @@ if audio_path:
     print(f"  File: {audio_path}")
     print(f"\nPlaying audio...")
     
-    subprocess.run(['start', audio_path], shell=True)
+    play_file(audio_path, wait=True)
     
     print(f"\n{'='*70}")
     print("If you hear a MALE voice, the fix worked! ✓")
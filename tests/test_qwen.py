@@ -7,6 +7,7 @@ import requests
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from colorama import init, Fore, Style
 
@@ -18,8 +19,29 @@ init(autoreset=True)
 
 BASE_URL = "http://127.0.0.1:5000"
 
-def ask_question(question):
-    """Ask a question through the brain (simulating voice input)"""
+def ask_qwen(question):
+    """Send one question to Qwen and return the reply text"""
+    # Add backend to path and import qwen_api module
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+    from core import qwen_api
+    
+    # Call Qwen with proper message format
+    messages = [
+        {"role": "system", "content": "You are Jarvis, a helpful AI assistant."},
+        {"role": "user", "content": question}
+    ]
+    return qwen_api.hedged_completion(messages)
+
+
+def ask_question(question, pending=None):
+    """
+    Ask a question through the brain (simulating voice input)
+    
+    Args:
+        question: Question text
+        pending: Future already fetching the answer (batch mode), or None
+            to ask now
+    """
     print(f"\n{Fore.CYAN}{'='*70}")
     print(f"YOU: {question}")
     print(f"{'='*70}{Style.RESET_ALL}\n")
@@ -38,16 +60,7 @@ def ask_question(question):
         
         print(f"{Fore.YELLOW}🤔 Thinking...{Style.RESET_ALL}")
         
-        # Add backend to path and import qwen_api module
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
-        from core import qwen_api
-        
-        # Call Qwen with proper message format
-        messages = [
-            {"role": "system", "content": "You are Jarvis, a helpful AI assistant."},
-            {"role": "user", "content": question}
-        ]
-        response = qwen_api.chat_completion(messages)
+        response = pending.result() if pending else ask_qwen(question)
         
         print(f"{Fore.GREEN}JARVIS: {response}{Style.RESET_ALL}\n")
         return response
@@ -86,9 +99,12 @@ def main():
             ask_question(custom_q)
         elif choice == "7":
             print(f"\n{Fore.YELLOW}🚀 Running batch test...{Style.RESET_ALL}")
-            for q in questions:
-                ask_question(q)
-                print(f"{Fore.BLUE}{'-'*70}{Style.RESET_ALL}")
+            # All requests go out at once; answers are printed in question order
+            with ThreadPoolExecutor(len(questions)) as pool:
+                pending = [pool.submit(ask_qwen, q) for q in questions]
+                for q, answer in zip(questions, pending):
+                    ask_question(q, answer)
+                    print(f"{Fore.BLUE}{'-'*70}{Style.RESET_ALL}")
         elif choice.isdigit() and 1 <= int(choice) <= 5:
             ask_question(questions[int(choice) - 1])
         else:
@@ -3,110 +3,150 @@ Test to measure ACTUAL energy levels in your environment.
 This will help us set realistic thresholds.
 """
 
-import pyaudio
-import struct
+import os
+import sys
 import time
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # energy_stats falls back to sorted()
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core import audio_io
+from backend.core.audio_io import rms_energy
+
 # Audio config
 CHUNK = 1024
-FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 16000
+GET_READY_SECONDS = 2  # Countdown before each measurement
+
+
+def energy_stats(energies):
+    """
+    Summarize per-chunk energies of one test.
+    
+    Returns:
+        (average, p95, maximum, minimum). P95 ignores the odd click or
+        bump, so thresholds are derived from it rather than the maximum.
+    """
+    if np is None:
+        ordered = sorted(energies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return sum(ordered) / len(ordered), p95, ordered[-1], ordered[0]
+    
+    values = np.asarray(energies)
+    minimum, p95, maximum = np.percentile(values, [0, 95, 100])
+    return float(values.mean()), float(p95), int(maximum), int(minimum)
+
+
+def get_ready(stream, seconds=GET_READY_SECONDS):
+    """
+    Count down before a measurement with the stream stopped.
+    
+    Nothing is captured while the user reads the instructions, so the
+    measurement starts on live audio instead of a backlog of stale chunks.
+    """
+    stream.stop_stream()
+    print("   Get ready:", end=" ", flush=True)
+    for n in range(seconds, 0, -1):
+        print(f"{n}...", end=" ", flush=True)
+        time.sleep(1)
+    print("GO!")
+    stream.start_stream()
+
+
+def fresh_chunks(chunks, count):
+    """Drop anything queued before the stream was stopped, then yield the next `count` chunks"""
+    audio_io.drain(chunks)
+    
+    for _ in range(count):
+        yield chunks.get(timeout=1)
+
 
 def measure_energy():
     """Measure real energy levels in different conditions"""
     
-    audio = pyaudio.PyAudio()
-    
     print("\n" + "="*70)
     print("🔬 REAL ENERGY LEVEL MEASUREMENT")
     print("="*70)
     
-    stream = audio.open(
-        format=FORMAT,
-        channels=CHANNELS,
-        rate=RATE,
-        input=True,
-        frames_per_buffer=CHUNK
-    )
+    # PortAudio's callback thread queues every chunk, so printing or a GC
+    # pause on this thread can't make the device drop input
+    stream, chunks = audio_io.open_mic_stream(rate=RATE, channels=CHANNELS, frames_per_buffer=CHUNK, start=False)
     
     # Test 1: Pure silence
     print("\n📊 TEST 1: PURE SILENCE")
     print("   Please stay COMPLETELY SILENT for 5 seconds...")
     print("   Don't move, don't breathe loudly, just freeze!")
-    time.sleep(2)
+    get_ready(stream)
     
     silence_energies = []
-    for i in range(80):  # 5 seconds
-        data = stream.read(CHUNK, exception_on_overflow=False)
-        samples = struct.unpack(f"{len(data)//2}h", data)
-        energy = int((sum(s**2 for s in samples) / len(samples))**0.5)
+    for i, data in enumerate(fresh_chunks(chunks, 80)):  # 5 seconds
+        energy = rms_energy(data)
         silence_energies.append(energy)
         
         if i % 16 == 0:  # Every second
             bar = "█" * min(50, energy // 2)
             print(f"   [{i//16 + 1}s] Energy: {energy:4d} | {bar}")
     
-    silence_avg = sum(silence_energies) / len(silence_energies)
-    silence_max = max(silence_energies)
+    silence_avg, silence_p95, silence_max, silence_min = energy_stats(silence_energies)
     print(f"\n   ✅ Pure Silence Results:")
     print(f"      Average: {silence_avg:.1f}")
+    print(f"      P95:     {silence_p95:.1f}")
     print(f"      Maximum: {silence_max}")
-    print(f"      Minimum: {min(silence_energies)}")
+    print(f"      Minimum: {silence_min}")
     
     # Test 2: Normal speaking
     print("\n📊 TEST 2: NORMAL SPEAKING")
     print("   Now speak NORMALLY for 5 seconds...")
     print("   Say things like: 'What time is it? Tell me about the weather.'")
-    time.sleep(2)
+    get_ready(stream)
     
     speech_energies = []
-    for i in range(80):  # 5 seconds
-        data = stream.read(CHUNK, exception_on_overflow=False)
-        samples = struct.unpack(f"{len(data)//2}h", data)
-        energy = int((sum(s**2 for s in samples) / len(samples))**0.5)
+    for i, data in enumerate(fresh_chunks(chunks, 80)):  # 5 seconds
+        energy = rms_energy(data)
         speech_energies.append(energy)
         
         if i % 16 == 0:  # Every second
             bar = "█" * min(50, energy // 10)
             print(f"   [{i//16 + 1}s] Energy: {energy:4d} | {bar}")
     
-    speech_avg = sum(speech_energies) / len(speech_energies)
-    speech_max = max(speech_energies)
+    speech_avg, speech_p95, speech_max, speech_min = energy_stats(speech_energies)
     
     print(f"\n   ✅ Normal Speaking Results:")
     print(f"      Average: {speech_avg:.1f}")
+    print(f"      P95:     {speech_p95:.1f}")
     print(f"      Maximum: {speech_max}")
-    print(f"      Minimum: {min(speech_energies)}")
+    print(f"      Minimum: {speech_min}")
     
     # Test 3: Loud speaking
     print("\n📊 TEST 3: LOUD SPEAKING")
     print("   Now speak LOUDLY for 5 seconds...")
     print("   Speak like you're calling someone across a room!")
-    time.sleep(2)
+    get_ready(stream)
     
     loud_energies = []
-    for i in range(80):  # 5 seconds
-        data = stream.read(CHUNK, exception_on_overflow=False)
-        samples = struct.unpack(f"{len(data)//2}h", data)
-        energy = int((sum(s**2 for s in samples) / len(samples))**0.5)
+    for i, data in enumerate(fresh_chunks(chunks, 80)):  # 5 seconds
+        energy = rms_energy(data)
         loud_energies.append(energy)
         
         if i % 16 == 0:  # Every second
             bar = "█" * min(50, energy // 10)
             print(f"   [{i//16 + 1}s] Energy: {energy:4d} | {bar}")
     
-    loud_avg = sum(loud_energies) / len(loud_energies)
-    loud_max = max(loud_energies)
+    loud_avg, loud_p95, loud_max, loud_min = energy_stats(loud_energies)
     
     print(f"\n   ✅ Loud Speaking Results:")
     print(f"      Average: {loud_avg:.1f}")
+    print(f"      P95:     {loud_p95:.1f}")
     print(f"      Maximum: {loud_max}")
-    print(f"      Minimum: {min(loud_energies)}")
+    print(f"      Minimum: {loud_min}")
     
     stream.stop_stream()
     stream.close()
-    audio.terminate()
     
     # Analysis
     print("\n" + "="*70)
@@ -115,7 +155,7 @@ def measure_energy():
     
     print(f"\n1. SILENCE BASELINE:")
     print(f"   Average ambient noise: {silence_avg:.1f}")
-    print(f"   Peak ambient noise: {silence_max}")
+    print(f"   Peak ambient noise: {silence_max} (P95: {silence_p95:.1f})")
     
     print(f"\n2. SPEECH DETECTION:")
     print(f"   Normal speech average: {speech_avg:.1f}")
@@ -125,13 +165,14 @@ def measure_energy():
     print(f"\n3. RECOMMENDED THRESHOLDS:")
     
     # Calculate smart thresholds
-    # Speech threshold should be between silence max and speech average
-    recommended_speech = int((silence_max + speech_avg) / 2)
+    # Speech threshold should be between silence P95 and speech average
+    # (P95 rather than max, so one click doesn't inflate it)
+    recommended_speech = int((silence_p95 + speech_avg) / 2)
     # But ensure it's at least 2x silence average
     recommended_speech = max(recommended_speech, int(silence_avg * 2))
     
     # Silence threshold should be just above ambient noise
-    recommended_silence = int(silence_avg + (silence_max - silence_avg) * 0.5)
+    recommended_silence = int(silence_avg + (silence_p95 - silence_avg) * 0.5)
     
     print(f"   Speech threshold: {recommended_speech} (triggers recording)")
     print(f"   Silence threshold: {recommended_silence} (stops recording)")
@@ -159,10 +200,13 @@ def measure_energy():
     
     return {
         'silence_avg': silence_avg,
+        'silence_p95': silence_p95,
         'silence_max': silence_max,
         'speech_avg': speech_avg,
+        'speech_p95': speech_p95,
         'speech_max': speech_max,
         'loud_avg': loud_avg,
+        'loud_p95': loud_p95,
         'loud_max': loud_max,
         'recommended_speech_threshold': recommended_speech,
         'recommended_silence_threshold': recommended_silence
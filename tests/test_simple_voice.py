@@ -9,14 +9,29 @@ This uses a simple approach that WORKS:
 
 import os
 import sys
+import queue
 import wave
 import pyaudio
 import time
-import struct
+import threading
+import winsound
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Falls back to a Python loop
+
+try:
+    import torch
+except ImportError:
+    torch = None  # No Silero VAD - energy thresholds are used instead
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.core import stt_local, brain, tts_manager
+from backend.core import audio_io, stt_local, brain, tts_manager, tts_streaming
+from backend.core.audio_io import rms_energy, vad_step
 
 print("\n" + "="*70)
 print("🎤 SIMPLE VOICE ASSISTANT TEST")
@@ -39,76 +54,241 @@ CHUNK = 1024
 FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 16000
+MAX_RECORD_SECONDS = 30  # Size of the preallocated capture buffer
+PRE_ROLL_CHUNKS = 8      # ~0.5s kept from before the trigger, so the first syllable isn't clipped
+
+SILERO_WINDOW = 512         # Silero VAD scores 32 ms windows at 16 kHz
+SPEECH_PROBABILITY = 0.5    # Silero score above this counts as speech
+SILERO_END_SILENCE = 0.7    # Seconds of non-speech that end the utterance
+STREAM_STEP_SECONDS = 0.4   # Re-transcribe the unconfirmed audio this often while recording
+
+# Energy VAD settings (used when Silero is unavailable)
+SILENCE_THRESHOLD = 150   # Below this = silence/fan noise
+SPEECH_THRESHOLD = 230    # Must exceed this to start recording
+MAX_SILENCE_CHUNKS = 24   # ~1.5 seconds
+UI_REFRESH_SECONDS = 0.1  # Redraw the energy meter at most 10x per second
+
+audio = audio_io.get_pyaudio()
+
+# Capture runs on PortAudio's callback thread; record_with_vad only drains
+# the queue, so the meter printing can't cause dropped input. The stream is
+# opened once and started/stopped around each recording.
+stream, chunks = audio_io.open_mic_stream(audio, RATE, CHANNELS, CHUNK, start=False)
+
+
+def beep(frequency, duration):
+    """Play a beep without blocking the caller (winsound.Beep is synchronous)"""
+    threading.Thread(target=winsound.Beep, args=(frequency, duration), daemon=True).start()
+
+
+def load_silero_vad():
+    """Load Silero VAD once (None if torch/numpy or the model is unavailable)"""
+    if torch is None or np is None:
+        return None
+    
+    try:
+        model, _ = torch.hub.load('snakers4/silero-vad', 'silero_vad', trust_repo=True)
+        return model
+    except Exception as e:
+        print(f"⚠️  Silero VAD unavailable ({e}) - using energy thresholds\n")
+        return None
+
+
+vad_model = load_silero_vad()
+
+
+def speech_probability(data):
+    """Highest Silero speech probability over the 512-sample windows of a chunk"""
+    samples = torch.from_numpy(np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0)
+    with torch.no_grad():
+        return max(vad_model(window, RATE).item() for window in samples.split(SILERO_WINDOW))
+
+
+# Compile the energy VAD step now rather than on the first recording
+audio_io.warm_up_vad_step(CHUNK)
+
+
+def stream_transcribe(recorded, progress, done):
+    """
+    Transcribe while the user is still speaking (LocalAgreement-2).
+    
+    Every STREAM_STEP_SECONDS the unconfirmed tail of the recording is
+    transcribed. Words that two consecutive passes agree on are confirmed:
+    their audio is cut from the next pass and their text becomes its
+    prompt. Once recording stops only the short unconfirmed tail is left
+    to transcribe.
+    
+    Args:
+        recorded: Capture buffer (raw int16) filled by record_with_vad
+        progress: One-item list with the number of bytes captured so far
+        done: threading.Event set when recording stops
+    
+    Returns:
+        str: Full transcript
+    """
+    def tail(start, end):
+        return np.frombuffer(bytes(recorded[start:end]), dtype=np.int16).astype(np.float32) / 32768.0
+    
+    confirmed = []
+    offset = 0      # Byte offset where unconfirmed audio starts
+    previous = []   # Unconfirmed words of the last pass
+    step_bytes = int(RATE * STREAM_STEP_SECONDS) * 2
+    
+    while not done.wait(STREAM_STEP_SECONDS):
+        end = progress[0]
+        if end - offset < step_bytes:
+            continue
+        
+        words = stt_local.transcribe_words(tail(offset, end), "".join(confirmed))
+        
+        # Confirm the longest common prefix of this pass and the last one
+        agreed = 0
+        while (agreed < min(len(words), len(previous))
+               and words[agreed][0].strip().lower() == previous[agreed][0].strip().lower()):
+            agreed += 1
+        
+        if agreed:
+            confirmed.extend(word for word, _ in words[:agreed])
+            offset += int(words[agreed - 1][1] * RATE) * 2
+        previous = words[agreed:]
+    
+    end = progress[0]
+    if end > offset:
+        confirmed.extend(word for word, _ in stt_local.transcribe_words(tail(offset, end), "".join(confirmed)))
+    
+    return "".join(confirmed).strip()
+
+
+def speak_sentences(sentences, first_spoken):
+    """
+    Speak queued sentences in order until None is queued.
+    
+    Runs next to the brain stream so the first sentence is spoken while
+    the rest of the reply is still being generated.
+    
+    Args:
+        sentences: queue.Queue of sentences from the SentenceBuffer
+        first_spoken: Empty list; receives how long the first sentence took to speak
+    """
+    while (sentence := sentences.get()) is not None:
+        start = time.time()
+        audio_path, engine = tts_manager.speak(sentence, prefer_offline=True)
+        
+        # "pyttsx3_direct" means the engine already spoke it; otherwise play and delete the WAV
+        if audio_path and audio_path != "pyttsx3_direct":
+            winsound.PlaySound(audio_path, winsound.SND_FILENAME)
+            try:
+                os.remove(audio_path)
+            except OSError:
+                pass
+        
+        if not first_spoken:
+            first_spoken.append(time.time() - start)
 
-audio = pyaudio.PyAudio()
 
 def record_with_vad():
-    """Record audio with automatic silence detection"""
+    """
+    Record audio with automatic silence detection.
+    
+    Returns:
+        (filename, transcript): WAV path, and a Future with the streamed
+        transcript (None when numpy is missing or no speech was captured)
+    """
     print("🔴 Press ENTER to start recording...")
     input()
     
     print("\n🎙️  RECORDING... Speak now!")
     print("   (Will stop after 1.5 seconds of silence)")
     
-    import winsound
-    winsound.Beep(1000, 100)
+    # Capture starts while the beep is still playing
+    beep(1000, 100)
+    audio_io.drain(chunks)  # Leftovers from the previous recording
+    stream.start_stream()
     
-    stream = audio.open(
-        format=FORMAT,
-        channels=CHANNELS,
-        rate=RATE,
-        input=True,
-        frames_per_buffer=CHUNK
-    )
-    
-    frames = []
-    silence_threshold = 150   # Below this = silence/fan noise
-    speech_threshold = 230    # Must exceed this to start recording
+    # One buffer for the whole utterance, filled at a moving offset
+    recorded = bytearray(RATE * MAX_RECORD_SECONDS * audio.get_sample_size(FORMAT))
+    pos = 0
+    progress = [0]              # pos, shared with the streaming transcriber
+    done = threading.Event()
+    transcript = None
     silence_chunks = 0
-    max_silence = 24  # ~1.5 seconds
-    recording = False
+    max_silence = MAX_SILENCE_CHUNKS
     started = False
+    last_ui = 0.0
+    pre_roll = deque(maxlen=PRE_ROLL_CHUNKS)  # Most recent chunks, trigger chunk included
     
-    print("   Waiting for speech (energy > 230)...")
+    if vad_model is not None:
+        vad_model.reset_states()  # Silero keeps context between windows
+        max_silence = round(SILERO_END_SILENCE * RATE / CHUNK)
+        print("   Waiting for speech (Silero VAD)...")
+    else:
+        print("   Waiting for speech (energy > 230)...")
     
     while True:
-        data = stream.read(CHUNK, exception_on_overflow=False)
+        try:
+            data = chunks.get(timeout=1)
+        except queue.Empty:
+            print("\n   ⚠️  Microphone stopped delivering audio")
+            break
+        
+        if not started:
+            pre_roll.append(data)
         
-        # Calculate energy
-        samples = struct.unpack(f"{len(data)//2}h", data)
-        energy = int((sum(s**2 for s in samples) / len(samples))**0.5)
+        # Speech decision: Silero probability, or the energy VAD step
+        # (compiled when numba is available)
+        if vad_model is not None:
+            energy = rms_energy(data)
+            is_speech = speech_probability(data) > SPEECH_PROBABILITY
+            starting = not started and is_speech
+            if started:
+                silence_chunks = 0 if is_speech else silence_chunks + 1
+            finished = started and silence_chunks >= max_silence
+        else:
+            samples = np.frombuffer(data, dtype=np.int16) if np is not None else data
+            energy, now_started, silence_chunks, finished = vad_step(
+                samples, started, silence_chunks,
+                SILENCE_THRESHOLD, SPEECH_THRESHOLD, max_silence
+            )
+            starting = now_started and not started
+            is_speech = energy > SPEECH_THRESHOLD
         
-        # Visual feedback
-        bar = "█" * min(50, energy // 5)
-        status = "🎤 SPEAKING" if energy > speech_threshold else "🔇 waiting..."
-        print(f"\r   {status} | Energy: {energy:4d} | {bar:50} ", end="", flush=True)
+        # Visual feedback (throttled - flushed console writes are slow on Windows)
+        now = time.monotonic()
+        if now - last_ui >= UI_REFRESH_SECONDS:
+            bar = "█" * min(50, energy // 5)
+            status = "🎤 SPEAKING" if is_speech else "🔇 waiting..."
+            print(f"\r   {status} | Energy: {energy:4d} | {bar:50} ", end="", flush=True)
+            last_ui = now
         
         # Start recording only on strong speech
-        if not started and energy > speech_threshold:
+        if starting:
             print("\n   ✅ Speech detected! Recording...")
             started = True
-            recording = True
-            frames = [data]
-            silence_chunks = 0
+            for chunk in pre_roll:
+                recorded[pos:pos + len(chunk)] = chunk
+                pos += len(chunk)
+            progress[0] = pos
+            if np is not None:
+                transcript = stt_pool.submit(stream_transcribe, recorded, progress, done)
             continue
         
         # Continue recording
-        if recording:
-            frames.append(data)
+        if started:
+            if pos + len(data) > len(recorded):
+                print(f"\n\n⏱️  {MAX_RECORD_SECONDS}s limit reached - stopping...")
+                break
+            recorded[pos:pos + len(data)] = data
+            pos += len(data)
+            progress[0] = pos
             
             # Silence detection
-            if energy < silence_threshold:
-                silence_chunks += 1
-                if silence_chunks >= max_silence:
-                    print("\n\n🔇 Silence detected - stopping...")
-                    recording = False
-                    break
-            else:
-                silence_chunks = 0
+            if finished:
+                print("\n\n🔇 Silence detected - stopping...")
+                break
     
+    done.set()
     stream.stop_stream()
-    stream.close()
-    winsound.Beep(800, 100)
+    beep(800, 100)
     
     # Save to file
     filename = "simple_test.wav"
@@ -116,21 +296,30 @@ def record_with_vad():
     wf.setnchannels(CHANNELS)
     wf.setsampwidth(audio.get_sample_size(FORMAT))
     wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
+    wf.writeframes(memoryview(recorded)[:pos])
     wf.close()
     
     print(f"💾 Saved: {filename}\n")
-    return filename
+    return filename, transcript
+
+# Load and warm up the Whisper model before the first recording, so the
+# STT time printed for the first command is steady-state, not model load
+print("⏳ Loading speech recognition model...")
+if stt_local.warmup():
+    print("✅ Speech recognition ready\n")
+
+# Runs stream_transcribe next to the capture loop
+stt_pool = ThreadPoolExecutor(max_workers=1)
 
 try:
     while True:
         # Record
-        audio_file = record_with_vad()
+        audio_file, transcript = record_with_vad()
         
-        # STT
+        # STT (when streaming, only the unconfirmed tail is left to do)
         print("🎧 Transcribing...")
         start = time.time()
-        text = stt_local.transcribe_file(audio_file)
+        text = transcript.result() if transcript else stt_local.transcribe_file(audio_file)
         stt_time = time.time() - start
         
         if not text or text.strip() == "":
@@ -140,27 +329,48 @@ try:
         print(f"   You said: \"{text}\"")
         print(f"   STT time: {stt_time:.2f}s\n")
         
-        # Brain
+        # Brain + TTS (each sentence is spoken as soon as the LLM finishes it)
         print("🧠 Processing...")
+        sentences = queue.Queue()
+        first_spoken = []
+        speaker = threading.Thread(target=speak_sentences, args=(sentences, first_spoken), daemon=True)
+        speaker.start()
+        
+        buffer = tts_streaming.SentenceBuffer()
+        reply = []
+        first_sentence_time = None
         start = time.time()
-        result = brain.process_command(text)
+        for chunk in brain.stream_command(text):
+            reply.append(chunk)
+            for sentence in buffer.feed(chunk):
+                if first_sentence_time is None:
+                    first_sentence_time = time.time() - start
+                sentences.put(sentence)
+        
+        rest = buffer.flush()
+        if rest:
+            sentences.put(rest)
         brain_time = time.time() - start
+        if first_sentence_time is None:
+            first_sentence_time = brain_time
+        sentences.put(None)
         
-        response = result.get("response", "")
+        response = "".join(reply).strip()
         print(f"   Response: \"{response}\"")
-        print(f"   Brain time: {brain_time:.2f}s\n")
+        print(f"   Brain time: {brain_time:.2f}s (first sentence: {first_sentence_time:.2f}s)\n")
         
-        # TTS
+        # TTS (only the speech still queued when the reply ended is waited for)
         print("🔊 Speaking...")
-        start = time.time()
-        tts_manager.speak(response, use_offline=True)
-        tts_time = time.time() - start
-        print(f"   TTS time: {tts_time:.2f}s\n")
+        speaker.join()
+        tts_time = time.time() - start - brain_time
+        tts_ttfb = first_spoken[0] if first_spoken else 0.0
+        print(f"   TTS time: {tts_time:.2f}s (first sentence: {tts_ttfb:.2f}s)\n")
         
         # Summary
         total = stt_time + brain_time + tts_time
         print("="*70)
         print(f"⏱️  TOTAL TIME: {total:.2f}s (STT: {stt_time:.1f}s | Brain: {brain_time:.1f}s | TTS: {tts_time:.1f}s)")
+        print(f"⚡ FIRST SENTENCE READY: {stt_time + first_sentence_time:.2f}s after speech ended")
         print("="*70 + "\n")
         
         # Cleanup
@@ -168,4 +378,4 @@ try:
 
 except KeyboardInterrupt:
     print("\n\n✅ Test complete!")
-    audio.terminate()
+    stream.close()
@@ -4,7 +4,7 @@ Test AI-powered song name extraction from various voice commands
 
 import sys
 sys.path.insert(0, r'c:\Users\Lunar Panda\3-Main\assistant')
-from backend.core.brain import process_command
+from backend.core.brain import process_commands
 
 print('\n' + '='*70)
 print('🎵 AI SONG NAME EXTRACTION TEST')
@@ -21,9 +21,9 @@ test_cases = [
 ]
 
 print('Testing AI song extraction...\n')
-for i, command in enumerate(test_cases, 1):
+results = process_commands(test_cases)  # one AI extraction call for all commands
+for i, (command, result) in enumerate(zip(test_cases, results), 1):
     print(f'{i}. Command: "{command}"')
-    result = process_command(command)
     extracted = result.get('query', 'NO QUERY')
     platform = result.get('intent', 'unknown')
     
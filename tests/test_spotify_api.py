@@ -4,6 +4,8 @@ Test Spotify API Integration
 
 import sys
 import os
+import json
+import time
 sys.path.insert(0, r'c:\Users\Lunar Panda\3-Main\assistant')
 
 # Load environment variables
@@ -35,7 +37,18 @@ input("\nPress ENTER to continue...")
 
 print("\n🔧 Setting up Spotify API...")
 
-from backend.skills.spotify_api import get_spotify_player
+from backend.skills.spotify_api import get_spotify_player, SPOTIFY_TOKEN_CACHE
+
+# Check the cached token first (a valid one skips the browser authorization)
+try:
+    with open(SPOTIFY_TOKEN_CACHE, encoding="utf-8") as f:
+        expires_in = json.load(f).get("expires_at", 0) - time.time()
+    if expires_in > 60:
+        print(f"✅ Cached token valid for {expires_in / 60:.0f} more minutes")
+    else:
+        print("⏳ Cached token expired - it will be refreshed")
+except (OSError, ValueError):
+    print("⚠️  No cached token - browser will open for authorization")
 
 player = get_spotify_player()
 
@@ -9,42 +9,9 @@ import time
 sys.path.insert(0, r'c:\Users\Lunar Panda\3-Main\assistant')
 
 from backend.skills.music_player import play_on_spotify
+from backend.skills.spotify_api import get_spotify_player
 
-def check_dependencies():
-    """Check if required libraries are installed"""
-    print("\n" + "="*70)
-    print("🔍 CHECKING DEPENDENCIES")
-    print("="*70)
-    
-    deps = {
-        'pyautogui': False,
-        'pygetwindow': False,
-    }
-    
-    try:
-        import pyautogui
-        deps['pyautogui'] = True
-        print("✅ pyautogui installed")
-    except:
-        print("❌ pyautogui NOT installed")
-    
-    try:
-        import pygetwindow
-        deps['pygetwindow'] = True
-        print("✅ pygetwindow installed")
-    except:
-        print("❌ pygetwindow NOT installed")
-    
-    if not all(deps.values()):
-        print("\n⚠️  Missing dependencies! Install with:")
-        if not deps['pyautogui']:
-            print("   pip install pyautogui")
-        if not deps['pygetwindow']:
-            print("   pip install pygetwindow")
-        print()
-    
-    return all(deps.values())
-
+PLAYBACK_TIMEOUT = 5  # Seconds for a song to start playing
 
 def test_basic_spotify_open():
     """Test 1: Just open Spotify (no auto-play)"""
@@ -79,98 +46,52 @@ def test_basic_spotify_open():
         return False
 
 
-def test_window_detection():
-    """Test 2: Check if we can detect Spotify window"""
-    print("\n" + "="*70)
-    print("TEST 2: Window Detection")
-    print("="*70)
-    print("\n📌 This test checks if we can find Spotify window")
-    print("   Make sure Spotify is already open!\n")
-    
-    input("Press ENTER to start test...")
-    
-    try:
-        import pygetwindow as gw
-        
-        print("\n🔍 Searching for Spotify window...")
-        all_windows = gw.getAllWindows()
-        
-        print(f"\nFound {len(all_windows)} total windows")
-        
-        # Try different patterns
-        patterns = ['Spotify Premium', 'Spotify Free', 'Spotify']
-        found = False
-        
-        for pattern in patterns:
-            windows = gw.getWindowsWithTitle(pattern)
-            if windows:
-                print(f"✅ Found window with '{pattern}': {windows[0].title}")
-                found = True
-                break
-        
-        if not found:
-            print("❌ No Spotify window found")
-            print("\n📋 All window titles containing 'Spot' or 'Music':")
-            for w in all_windows:
-                if 'spot' in w.title.lower() or 'music' in w.title.lower():
-                    print(f"   - {w.title}")
-        
-        return found
-        
-    except ImportError:
-        print("❌ pygetwindow not installed!")
-        print("   Install: pip install pygetwindow")
-        return False
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
-
-
 def test_full_autoplay():
-    """Test 3: Full auto-play test with timing details"""
+    """Test 2: Full auto-play through the Spotify Web API"""
     print("\n" + "="*70)
-    print("TEST 3: Full Auto-Play")
+    print("TEST 2: Full Auto-Play")
     print("="*70)
     print("\n📌 This test does the complete auto-play flow")
-    print("   Opens Spotify → Waits → Focuses → Presses Enter\n")
+    print("   Search → start_playback on your Spotify device → verify\n")
+    
+    player = get_spotify_player()
+    if not player:
+        print("❌ Spotify API not authenticated - run test_spotify_api.py first")
+        return False
     
     song = input("Enter song name (or press ENTER for 'tears'): ").strip()
     if not song:
         song = "tears"
     
     print(f"\n🎵 Testing auto-play for: {song}")
-    print("\n⏱️  Timeline:")
-    print("   0.0s - Opening Spotify...")
-    
-    result = play_on_spotify(song)
-    
-    print(f"\n📊 Result: {result}")
+    start = time.monotonic()
+    result = player.search_and_play(song)
     
-    time.sleep(2)
-    response = input("\n❓ Did the song start playing automatically? (y/n): ").lower()
+    print(f"\n📊 Result: {result['message']}")
     
-    if response == 'y':
-        print("✅ AUTO-PLAY WORKS!")
+    if result['success'] and player.wait_until_playing(timeout=PLAYBACK_TIMEOUT):
+        print(f"✅ AUTO-PLAY WORKS! (playing after {time.monotonic() - start:.1f}s)")
         return True
     else:
         print("❌ Auto-play failed")
         print("\n🔧 Possible issues:")
-        print("   1. Timing too fast - Spotify didn't finish loading")
-        print("   2. Window focus failed - Enter pressed wrong window")
-        print("   3. Spotify UI changed - Enter doesn't play anymore")
+        print("   1. No Spotify device - open the Spotify app (or any Connect device)")
+        print("   2. Spotify Premium is required for playback control")
+        print("   3. Token expired - re-run test_spotify_api.py")
         return False
 
 
 def test_multiple_songs():
-    """Test 4: Test with multiple songs"""
+    """Test 3: Test with multiple songs"""
     print("\n" + "="*70)
-    print("TEST 4: Multiple Songs")
+    print("TEST 3: Multiple Songs")
     print("="*70)
     print("\n📌 Tests 3 different songs to verify consistency\n")
     
     songs = ["shape of you", "despacito", "bohemian rhapsody"]
     
-    input("Press ENTER to start (will take ~30 seconds)...")
+    player = get_spotify_player()
+    input("Press ENTER to start...")
     
     results = []
     for i, song in enumerate(songs, 1):
@@ -178,12 +99,12 @@ def test_multiple_songs():
         result = play_on_spotify(song)
         print(f"   Result: {result}")
         
-        if i < len(songs):
-            print("   Waiting 8 seconds before next song...")
-            time.sleep(8)
-        
-        response = input(f"   Did '{song}' play? (y/n): ").lower()
-        results.append(response == 'y')
+        if player:
+            played = player.wait_until_playing(timeout=PLAYBACK_TIMEOUT)
+            print(f"   {'✅ Playing' if played else '❌ Not playing'}")
+        else:
+            played = input(f"   Did '{song}' play? (y/n): ").lower() == 'y'
+        results.append(played)
     
     success_rate = (sum(results) / len(results)) * 100
     print(f"\n📊 Success Rate: {success_rate:.0f}% ({sum(results)}/{len(results)} songs played)")
@@ -196,46 +117,34 @@ def main():
     print("🎵 SPOTIFY AUTO-PLAY DEBUG SUITE 🎵")
     print("="*70)
     
-    # Check dependencies first
-    if not check_dependencies():
-        choice = input("\n⚠️  Continue anyway? (y/n): ").lower()
-        if choice != 'y':
-            print("Exiting...")
-            return
-    
     print("\n📋 Available Tests:")
     print("   1. Basic Spotify Open (no auto-play)")
-    print("   2. Window Detection Test")
-    print("   3. Full Auto-Play Test (single song)")
-    print("   4. Multiple Songs Test (3 songs)")
-    print("   5. Run All Tests")
+    print("   2. Full Auto-Play Test (single song)")
+    print("   3. Multiple Songs Test (3 songs)")
+    print("   4. Run All Tests")
     
-    choice = input("\nSelect test (1-5): ").strip()
+    choice = input("\nSelect test (1-4): ").strip()
     
     if choice == '1':
         test_basic_spotify_open()
     elif choice == '2':
-        test_window_detection()
-    elif choice == '3':
         test_full_autoplay()
-    elif choice == '4':
+    elif choice == '3':
         test_multiple_songs()
-    elif choice == '5':
+    elif choice == '4':
         print("\n🔄 Running all tests...\n")
         t1 = test_basic_spotify_open()
-        t2 = test_window_detection()
-        t3 = test_full_autoplay()
-        t4 = test_multiple_songs()
+        t2 = test_full_autoplay()
+        t3 = test_multiple_songs()
         
         print("\n" + "="*70)
         print("📊 FINAL RESULTS")
         print("="*70)
         print(f"Basic Open:        {'✅ PASS' if t1 else '❌ FAIL'}")
-        print(f"Window Detection:  {'✅ PASS' if t2 else '❌ FAIL'}")
-        print(f"Full Auto-Play:    {'✅ PASS' if t3 else '❌ FAIL'}")
-        print(f"Multiple Songs:    {'✅ PASS' if t4 else '❌ FAIL'}")
+        print(f"Full Auto-Play:    {'✅ PASS' if t2 else '❌ FAIL'}")
+        print(f"Multiple Songs:    {'✅ PASS' if t3 else '❌ FAIL'}")
         
-        if all([t1, t2, t3, t4]):
+        if all([t1, t2, t3]):
             print("\n🎉 ALL TESTS PASSED!")
         else:
             print("\n⚠️  Some tests failed - see above for details")
@@ -11,7 +11,7 @@ from colorama import init, Fore, Style
 init(autoreset=True)
 
 from core import tts_manager
-import subprocess
+from core.audio_io import play_file
 
 
 def test_tts_system():
@@ -49,7 +49,7 @@ def test_tts_system():
             
             # Play audio
             print(f"  Playing...")
-            subprocess.run(['start', audio_path], shell=True)
+            play_file(audio_path)
             
             input(f"\n  {Fore.CYAN}Press Enter to continue...{Style.RESET_ALL}")
         else:
@@ -68,7 +68,7 @@ def test_tts_system():
         print(f"  Engine: {engine}")
         print(f"  File: {audio_path}")
         
-        subprocess.run(['start', audio_path], shell=True)
+        play_file(audio_path, wait=True)
     else:
         print(f"{Fore.RED}  ✗ Offline TTS failed{Style.RESET_ALL}")
     